@@ -0,0 +1,47 @@
+"""catch up score dimensions, resume skill ids and llm cache
+
+Databases created by Base.metadata.create_all before these columns and
+tables existed do not get them on startup, so add them here. Every step
+is a no-op when the schema is already current.
+
+Revision ID: 3f1c2a9d7e01
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7e01'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE scores ADD COLUMN IF NOT EXISTS education_score DOUBLE PRECISION")
+    op.execute("ALTER TABLE scores ADD COLUMN IF NOT EXISTS experience_score DOUBLE PRECISION")
+    op.execute("ALTER TABLE scores ADD COLUMN IF NOT EXISTS skills_score DOUBLE PRECISION")
+    op.execute("ALTER TABLE resumes ADD COLUMN IF NOT EXISTS skill_ids BIGINT[]")
+
+    if not sa.inspect(op.get_bind()).has_table("llm_cache"):
+        op.create_table(
+            "llm_cache",
+            sa.Column("cache_key", sa.String(length=64), primary_key=True),
+            sa.Column("model_name", sa.String(), nullable=False),
+            sa.Column("response", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("last_accessed_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_llm_cache_created_at", "llm_cache", ["created_at"])
+        op.create_index("ix_llm_cache_last_accessed_at", "llm_cache", ["last_accessed_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("llm_cache")
+    op.drop_column("resumes", "skill_ids")
+    op.drop_column("scores", "skills_score")
+    op.drop_column("scores", "experience_score")
+    op.drop_column("scores", "education_score")
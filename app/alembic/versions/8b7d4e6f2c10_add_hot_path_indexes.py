@@ -0,0 +1,42 @@
+"""add hot path indexes
+
+Indexes for the candidates-by-job listing (scores by job ordered by score),
+the pipeline's resume lookup by (job_id, file_path), score/note joins on
+resume_id and candidate lookups by email. Built CONCURRENTLY so existing
+tables stay writable during the migration.
+
+Revision ID: 8b7d4e6f2c10
+Revises: 3f1c2a9d7e01
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b7d4e6f2c10'
+down_revision = '3f1c2a9d7e01'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_scores_job_id_score", "scores", "(job_id, score DESC)"),
+    ("ix_scores_resume_id", "scores", "(resume_id)"),
+    ("ix_resumes_job_id_file_path", "resumes", "(job_id, file_path)"),
+    ("ix_notes_resume_id", "notes", "(resume_id)"),
+    ("ix_candidates_email", "candidates", "(email)"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {columns}")
+        for table in sorted({table for _, table, _ in INDEXES}):
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
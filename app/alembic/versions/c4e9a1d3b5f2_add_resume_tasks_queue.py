@@ -0,0 +1,44 @@
+"""add resume tasks queue
+
+Revision ID: c4e9a1d3b5f2
+Revises: 8b7d4e6f2c10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e9a1d3b5f2'
+down_revision = '8b7d4e6f2c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("resume_tasks"):
+        return
+
+    op.create_table(
+        "resume_tasks",
+        sa.Column("task_id", sa.Integer(), primary_key=True),
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.job_id"), nullable=False),
+        sa.Column("s3_key", sa.String(), nullable=False),
+        sa.Column("weighting", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("locked_by", sa.String(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("job_id", "s3_key", name="uq_resume_tasks_job_id_s3_key"),
+    )
+    op.create_index("ix_resume_tasks_task_id", "resume_tasks", ["task_id"])
+    op.create_index("ix_resume_tasks_status_available_at", "resume_tasks", ["status", "available_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("resume_tasks")
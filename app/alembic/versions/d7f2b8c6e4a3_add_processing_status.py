@@ -0,0 +1,38 @@
+"""add processing status
+
+Revision ID: d7f2b8c6e4a3
+Revises: c4e9a1d3b5f2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f2b8c6e4a3'
+down_revision = 'c4e9a1d3b5f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("processing_status"):
+        return
+
+    op.create_table(
+        "processing_status",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.job_id"), primary_key=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_processing_status_expires_at", "processing_status", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("processing_status")
@@ -1,10 +1,11 @@
+import asyncio
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.core.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, get_password_hash, verify_password
 from app.crud.recruiter import authenticate_recruiter, create_recruiter, get_recruiter_by_email
 from app.schemas.schemas import RecruiterCreate, RecruiterResponse, Token, LoginRequest
@@ -27,10 +28,10 @@ class PasswordUpdate(BaseModel):
     confirm_password: str
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """OAuth2 compatible token login, get an access token for future requests."""
     # Authenticate user
-    user = authenticate_recruiter(db, form_data.username, form_data.password)
+    user = await authenticate_recruiter(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,10 +48,10 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Login endpoint that accepts JSON."""
     # Authenticate user
-    user = authenticate_recruiter(db, login_data.email, login_data.password)
+    user = await authenticate_recruiter(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,10 +67,10 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=RecruiterResponse)
-async def register(recruiter: RecruiterCreate, db: Session = Depends(get_db)):
+async def register(recruiter: RecruiterCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new recruiter."""
     # Check if email already exists
-    db_user = get_recruiter_by_email(db, recruiter.email)
+    db_user = await get_recruiter_by_email(db, recruiter.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -77,7 +78,7 @@ async def register(recruiter: RecruiterCreate, db: Session = Depends(get_db)):
         )
     
     # Create new recruiter
-    return create_recruiter(db, recruiter)
+    return await create_recruiter(db, recruiter)
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(current_user: Recruiter = Depends(get_current_active_user)):
@@ -97,12 +98,12 @@ async def get_current_user_profile(current_user: Recruiter = Depends(get_current
 async def update_user_profile(
     profile_data: ProfileUpdate,
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update the current user's profile."""
     # Check if email is being updated and if it's already in use
     if profile_data.email and profile_data.email != current_user.email:
-        existing_user = get_recruiter_by_email(db, profile_data.email)
+        existing_user = await get_recruiter_by_email(db, profile_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -120,8 +121,8 @@ async def update_user_profile(
         current_user.email = profile_data.email
     
     # Save changes to database
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
     
     return current_user
 
@@ -129,11 +130,11 @@ async def update_user_profile(
 async def update_user_password(
     password_data: PasswordUpdate,
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update the current user's password."""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password):
+    if not await asyncio.to_thread(verify_password, password_data.current_password, current_user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -147,9 +148,9 @@ async def update_user_password(
         )
     
     # Update password
-    current_user.password = get_password_hash(password_data.new_password)
+    current_user.password = await asyncio.to_thread(get_password_hash, password_data.new_password)
     
     # Save changes to database
-    db.commit()
+    await db.commit()
     
     return {"detail": "Password updated successfully"}
\ No newline at end of file
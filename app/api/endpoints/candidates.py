@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
 from typing import List
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
 from app.db.database import get_db
-from app.models.models import Candidate, Resume, Score
-from app.schemas.schemas import CandidateResponse
+from app.models.models import Candidate, Resume, Score, Job
+from app.schemas.schemas import CandidateResponse, SkillMatchCandidate
+from app.services.skill_index import skill_index
+from app.job_matcher.skill_registry import skill_registry
 
 router = APIRouter()
 
@@ -62,6 +64,59 @@ def get_candidates_by_job(
         for candidate, resume, score in candidates
     ]
 
+@router.get("/match/{job_id}", response_model=List[SkillMatchCandidate])
+def match_candidates_for_job(
+    job_id: int = Path(..., title="The ID of the job to match candidates against", ge=1),
+    limit: int = Query(10, title="Maximum number of candidates to return", ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Find the best candidates in the whole pool for a job using the skill index.
+    
+    - **job_id**: ID of the job whose skills are matched
+    - **limit**: Maximum number of candidates to return
+    
+    Candidates are ranked by the fraction of the job's skills found on their resume,
+    regardless of which job the resume was uploaded for.
+    """
+    job = db.query(Job).filter(Job.job_id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+
+    skill_index.ensure_built(db)
+    matches = skill_index.top_k(job.skills or [], k=limit)
+    if not matches:
+        return []
+    skill_names = skill_registry.names(job.skills or [])
+
+    # Load all matched resumes and their candidates in one query
+    rows = (
+        db.query(Resume, Candidate)
+        .outerjoin(Candidate, Candidate.candidate_id == Resume.candidate_id)
+        .filter(Resume.resume_id.in_([resume_id for resume_id, _, _ in matches]))
+        .all()
+    )
+    by_resume_id = {resume.resume_id: (resume, candidate) for resume, candidate in rows}
+
+    results = []
+    for resume_id, matched_ids, coverage in matches:
+        if resume_id not in by_resume_id:
+            continue
+        resume, candidate = by_resume_id[resume_id]
+        results.append(SkillMatchCandidate(
+            candidate_id=candidate.candidate_id if candidate else None,
+            resume_id=resume_id,
+            job_id=resume.job_id,
+            name=candidate.name if candidate else None,
+            email=candidate.email if candidate else None,
+            matched_skills=[skill_names[sid] for sid in matched_ids],
+            coverage=coverage
+        ))
+    return results
+
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 def get_candidate(
     candidate_id: int = Path(..., title="The ID of the candidate to get", ge=1),
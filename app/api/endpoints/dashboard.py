@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
 from typing import List, Dict, Any
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.models import Job, Candidate, Resume, Score, Recruiter, JobStatus
 from app.core.auth import get_current_active_user
 from app.schemas.schemas import RecruiterResponse
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.get("/stats", response_model=Dict[str, Any])
 async def get_dashboard_stats(
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get dashboard statistics:
@@ -24,25 +24,25 @@ async def get_dashboard_stats(
     - Recent job growth
     """
     # Get total candidates count
-    total_candidates = db.query(func.count(Candidate.candidate_id)).scalar()
+    total_candidates = await db.scalar(select(func.count(Candidate.candidate_id)))
     
     # Get candidates added in the last month
     from datetime import datetime, timedelta
     one_month_ago = datetime.utcnow() - timedelta(days=30)
     
-    new_candidates = db.query(func.count(Candidate.candidate_id)).filter(
+    new_candidates = await db.scalar(select(func.count(Candidate.candidate_id)).where(
         Candidate.created_at >= one_month_ago
-    ).scalar()
+    ))
     
     # Get active jobs count
-    active_jobs_count = db.query(func.count(Job.job_id)).filter(
+    active_jobs_count = await db.scalar(select(func.count(Job.job_id)).where(
         Job.status == JobStatus.ACTIVE.value
-    ).scalar()
+    ))
     
     # Get new jobs in the last month
-    new_jobs = db.query(func.count(Job.job_id)).filter(
+    new_jobs = await db.scalar(select(func.count(Job.job_id)).where(
         Job.created_at >= one_month_ago
-    ).scalar()
+    ))
     
     return {
         "total_candidates": total_candidates,
@@ -56,12 +56,12 @@ async def get_dashboard_stats(
 async def get_recent_candidates(
     limit: int = 5,
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get recently added candidates with their highest match scores
     """
-    recent_candidates = db.query(
+    recent_candidates = (await db.execute(select(
         Candidate.candidate_id,
         Candidate.name,
         Candidate.email,
@@ -78,7 +78,7 @@ async def get_recent_candidates(
         Candidate.candidate_id, Candidate.name, Candidate.email, Resume.resume_id
     ).order_by(
         desc(Candidate.created_at)
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     result = []
     for candidate in recent_candidates:
@@ -97,12 +97,12 @@ async def get_recent_candidates(
 async def get_job_postings(
     limit: int = 5,
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get active job postings with candidate counts and average scores
     """
-    job_postings = db.query(
+    job_postings = (await db.execute(select(
         Job.job_id,
         Job.title,
         Job.type,
@@ -115,13 +115,13 @@ async def get_job_postings(
         Resume, Resume.job_id == Job.job_id
     ).outerjoin(
         Score, Score.resume_id == Resume.resume_id
-    ).filter(
+    ).where(
         Job.status == JobStatus.ACTIVE.value
     ).group_by(
         Job.job_id, Job.title, Job.department, Job.location, Job.type, Job.created_at
     ).order_by(
         desc(Job.created_at)
-    ).limit(limit).all()
+    ).limit(limit))).all()
     
     result = []
     for job in job_postings:
@@ -142,7 +142,7 @@ async def get_job_postings(
 @router.get("/activity", response_model=Dict[str, List[int]])
 async def get_activity_data(
     current_user: Recruiter = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get candidate matching activity for the past 30 days
@@ -158,26 +158,26 @@ async def get_activity_data(
     applications_data = [0] * 30
     
     # Get resume submissions (applications) by day
-    applications = db.query(
+    applications = (await db.execute(select(
         func.date(Resume.created_at).label("date"),
         func.count().label("count")
-    ).filter(
+    ).where(
         func.date(Resume.created_at) >= start_date,
         func.date(Resume.created_at) <= today
     ).group_by(
         func.date(Resume.created_at)
-    ).all()
+    ))).all()
     
     # Get score calculations (matches) by day
-    matches = db.query(
+    matches = (await db.execute(select(
         func.date(Score.created_at).label("date"),
         func.count().label("count")
-    ).filter(
+    ).where(
         func.date(Score.created_at) >= start_date,
         func.date(Score.created_at) <= today
     ).group_by(
         func.date(Score.created_at)
-    ).all()
+    ))).all()
     
     # Fill in the data arrays
     for app in applications:
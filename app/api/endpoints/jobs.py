@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
-from app.schemas.schemas import Job, JobCreate, JobUpdate
+from app.schemas.schemas import Job, JobCreate, JobUpdate, ScoreWeights, RescoreResponse, RankedCandidate
 from app.crud import job as crud_job
 from app.db.database import get_db
 
@@ -82,6 +82,53 @@ def update_job(
     return db_job
 
 
+@router.post("/{job_id}/rescore", response_model=RescoreResponse)
+def rescore_job(
+    job_id: int = Path(..., title="The ID of the job to rescore", ge=1),
+    weights: ScoreWeights = ...,
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute weighted scores and rankings for a job without re-running the LLM.
+    
+    - **job_id**: ID of the job to rescore
+    - **Request body**: New weights for skills, experience and education (normalized to sum to 1.0)
+    """
+    if crud_job.get_job(db, job_id=job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    total_weight = weights.skills + weights.experience + weights.education
+    if total_weight <= 0:
+        raise HTTPException(status_code=400, detail="At least one weight must be greater than 0")
+
+    # Normalize weights to ensure they sum to 1.0
+    weighting = {
+        "skills": weights.skills / total_weight,
+        "experience": weights.experience / total_weight,
+        "education": weights.education / total_weight
+    }
+
+    updated, rankings = crud_job.rescore_job(db, job_id=job_id, weighting=weighting)
+    return RescoreResponse(
+        job_id=job_id,
+        weights=ScoreWeights(**weighting),
+        updated_scores=updated,
+        rankings=[
+            RankedCandidate(
+                rank=row.rank,
+                candidate_id=row.candidate_id,
+                resume_id=row.resume_id,
+                name=row.name,
+                score=row.score,
+                skills_score=row.skills_score,
+                experience_score=row.experience_score,
+                education_score=row.education_score
+            )
+            for row in rankings
+        ]
+    )
+
+
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_job(
     job_id: int = Path(..., title="The ID of the job to delete", ge=1),
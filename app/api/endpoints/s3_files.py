@@ -1,15 +1,18 @@
 # app/api/endpoints/s3_files.py
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict
+import asyncio
 import time
 
-from app.services.s3_service import S3Service
+from app.services.s3_service import S3Service, get_s3_client_metrics, S3_UPLOAD_CONCURRENCY
 from app.services.resume_processing_service import start_resume_processing, resume_processing_service
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, get_async_db
 import os
-from sqlalchemy.sql import func
+from sqlalchemy import insert
 from app.models.models import Candidate, Resume
 
 router = APIRouter(prefix="/s3", tags=["files"])
@@ -20,7 +23,6 @@ def get_s3_service():
 
 @router.post("/upload", status_code=201)
 async def upload_files(
-    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     job_id: int = Form(...),
     skill_weight: float = Form(...),
@@ -32,38 +34,58 @@ async def upload_files(
     """
     Upload multiple resume files to S3 and start processing
     
-    This endpoint handles both the file upload to S3 and initiates the background 
-    processing of those resumes against a job description.
+    This endpoint handles both the file upload to S3 and queues the processing
+    of those resumes against a job description for the resume workers.
     """
     uploaded_files = []
     errors = []
     s3_keys = []
+    valid_files = []
     
     for file in files:
         # Validate file type
         if not file.filename.lower().endswith(('.pdf', '.docx', '.doc')):
             errors.append(f"Invalid file type for {file.filename}: Only PDF and Word documents are allowed")
             continue
+        valid_files.append(file)
+    
+    # Upload to S3 concurrently, at most S3_UPLOAD_CONCURRENCY files at a time
+    upload_slots = asyncio.Semaphore(S3_UPLOAD_CONCURRENCY)
+    
+    async def upload(file):
+        async with upload_slots:
+            return await run_in_threadpool(s3_service.upload_file, file)
+    
+    upload_results = await asyncio.gather(*(upload(file) for file in valid_files), return_exceptions=True)
+    
+    uploaded = []
+    for file, upload_result in zip(valid_files, upload_results):
+        if isinstance(upload_result, Exception):
+            errors.append(f"Failed to upload {file.filename}: {str(upload_result)}")
+            continue
+        uploaded.append((file, upload_result))
+    
+    try:
+        # Create placeholder candidates and their resume records in one transaction;
+        # a file whose rows cannot be inserted is reported on its own
+        record_ids = create_upload_records(db, job_id, [s3_key for _, s3_key in uploaded])
         
-        try:
-            # Upload to S3
-            s3_key = s3_service.upload_file(file)
+        for (file, s3_key), record in zip(uploaded, record_ids):
+            if isinstance(record, Exception):
+                errors.append(f"Failed to upload {file.filename}: {str(record)}")
+                continue
+            candidate_id, resume_id = record
             s3_keys.append(s3_key)
-            
-            # Create a candidate record with placeholder data
-            candidate = create_or_update_candidate(db, "Unknown", "unknown@example.com", None)
-            
-            # Create a resume record linked to the candidate and job
-            resume = create_resume_record(db, candidate.candidate_id, job_id, s3_key)
-            
             uploaded_files.append({
                 "filename": file.filename,
                 "s3_key": s3_key,
-                "resume_id": resume.resume_id,
-                "candidate_id": candidate.candidate_id
+                "resume_id": resume_id,
+                "candidate_id": candidate_id
             })
-            
-        except Exception as e:
+    
+    except Exception as e:
+        db.rollback()
+        for file, _ in uploaded:
             errors.append(f"Failed to upload {file.filename}: {str(e)}")
     
     if not uploaded_files and errors:
@@ -77,12 +99,11 @@ async def upload_files(
         "education": education_weight / total_weight
     }
     
-    # Start processing in the background
+    # Queue processing for the resume workers
     processing_result = start_resume_processing(
         job_id=job_id,
         resume_s3_keys=s3_keys,
         weighting=weighting,
-        background_tasks=background_tasks,
         db=db
     )
     
@@ -91,7 +112,7 @@ async def upload_files(
         "job_id": job_id,
         "weights": weighting,
         "processing_status": processing_result,
-        "message": f"Successfully uploaded {len(uploaded_files)} files and started processing",
+        "message": f"Successfully uploaded {len(uploaded_files)} files and queued processing",
         "errors": errors if errors else None
     }
 
@@ -100,14 +121,13 @@ async def process_resumes(
     job_id: int,
     s3_keys: List[str],
     weighting: Dict[str, float],
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
-    Start processing resumes in the background
+    Queue resumes for processing
     
-    This endpoint initiates the background processing of resumes that were previously 
-    uploaded to S3. The process involves extracting text from the resumes, comparing 
+    This endpoint queues resumes that were previously uploaded to S3 for the
+    resume workers (python -m app.worker). The process involves extracting text from the resumes, comparing 
     against the job description, calculating match scores, and storing results in the database.
     
     - job_id: ID of the job to match against
@@ -129,27 +149,51 @@ async def process_resumes(
             detail="Weighting values must sum to 1.0"
         )
     
-    # Start the processing task
+    # Queue the processing tasks
     result = start_resume_processing(
         job_id=job_id,
         resume_s3_keys=s3_keys,
         weighting=weighting,
-        background_tasks=background_tasks,
         db=db
     )
     
     return result
 
 @router.get("/process-status/{job_id}")
-async def get_process_status(job_id: int):
+async def get_process_status(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get the status of a resume processing job
     
-    Returns the current status of a background resume processing task for a specific job.
+    Returns the current status of the queued resume processing tasks for a specific job.
     """
-    status = resume_processing_service.get_processing_status(job_id)
+    status = await resume_processing_service.get_processing_status(job_id, db)
     return status
 
+@router.get("/process-events/{job_id}")
+async def stream_process_events(job_id: int, request: Request):
+    """
+    Stream resume processing progress as server-sent events
+    
+    Sends the current status, then one event per resume as it is extracted, scored,
+    stored or fails (with stage timings), plus a status event after each finished
+    resume. The stream ends once the job is completed.
+    """
+    return StreamingResponse(
+        resume_processing_service.stream_progress(job_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/client-metrics")
+async def s3_client_metrics():
+    """
+    Get S3 client metrics
+    
+    Returns the one-time client construction cost next to the average cost of reusing
+    the shared client.
+    """
+    return get_s3_client_metrics()
+
 @router.get("/files", response_model=List[str])
 async def list_files(s3_service: S3Service = Depends(get_s3_service)):
     """List all files in S3 bucket"""
@@ -185,48 +229,49 @@ async def delete_file(
     return {"message": "File deleted successfully"}
 
 # Helper functions for candidate and resume creation
-def create_or_update_candidate(db: Session, name: str, email: str, phone: str = None):
-    """Create a new candidate or update existing one"""
-    # For placeholder emails, generate a unique email to avoid unique constraint errors
-    if email == "unknown@example.com":
-        # Generate a unique email using timestamp to avoid collision
-        unique_id = int(time.time() * 1000)
-        email = f"unknown_{unique_id}@example.com"
-    
-    # Check if candidate with this email already exists
-    existing = None
-    if email and '@example.com' not in email:
-        existing = db.query(Candidate).filter(Candidate.email == email).first()
-    
-    if existing:
-        # Update existing candidate if needed
-        if name and name != "Unknown" and existing.name == "Unknown":
-            existing.name = name
-        if phone and not existing.phone:
-            existing.phone = phone
-        db.commit()
-        return existing
-    
-    # Create new candidate
-    candidate = Candidate(
-        name=name,
-        email=email,
-        phone=phone
-    )
-    db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
-    return candidate
+def insert_upload_records(db: Session, job_id: int, s3_keys: List[str], emails: List[str]):
+    """Insert placeholder candidates and their resume rows, two multi-row INSERT ... RETURNING statements"""
+    candidate_ids = db.execute(
+        insert(Candidate).returning(Candidate.candidate_id, sort_by_parameter_order=True),
+        [{"name": "Unknown", "email": email, "phone": None} for email in emails]
+    ).scalars().all()
+    
+    resume_ids = db.execute(
+        insert(Resume).returning(Resume.resume_id, sort_by_parameter_order=True),
+        [
+            {"candidate_id": candidate_id, "job_id": job_id, "file_path": s3_key}
+            for candidate_id, s3_key in zip(candidate_ids, s3_keys)
+        ]
+    ).scalars().all()
+    return list(zip(candidate_ids, resume_ids))
 
-def create_resume_record(db: Session, candidate_id: int, job_id: int, file_path: str):
-    """Create a new resume record"""
-    resume = Resume(
-        candidate_id=candidate_id,
-        job_id=job_id,
-        file_path=file_path,
-        created_at=func.now()
-    )
-    db.add(resume)
+def create_upload_records(db: Session, job_id: int, s3_keys: List[str]):
+    """
+    Create a placeholder candidate and a resume record for each uploaded file
+    in a single transaction. Returns, in the order of s3_keys, either the
+    (candidate_id, resume_id) pair or the exception that kept the file from
+    being recorded.
+    """
+    if not s3_keys:
+        return []
+    
+    # Placeholder emails must be unique, so suffix a per-upload timestamp with the file index
+    batch_id = int(time.time() * 1000)
+    emails = [f"unknown_{batch_id}_{index}@example.com" for index in range(len(s3_keys))]
+    
+    try:
+        with db.begin_nested():
+            records = insert_upload_records(db, job_id, s3_keys, emails)
+    except Exception:
+        # Retry file by file, each in its own savepoint, so only the files
+        # that cannot be inserted are reported as failed
+        records = []
+        for s3_key, email in zip(s3_keys, emails):
+            try:
+                with db.begin_nested():
+                    records.extend(insert_upload_records(db, job_id, [s3_key], [email]))
+            except Exception as e:
+                records.append(e)
+    
     db.commit()
-    db.refresh(resume)
-    return resume
\ No newline at end of file
+    return records
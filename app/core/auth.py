@@ -1,9 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.core.security import decode_token
 from app.models.models import Recruiter
 from app.crud.recruiter import get_recruiter_by_email
@@ -11,7 +11,7 @@ from app.crud.recruiter import get_recruiter_by_email
 # OAuth2 password bearer scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """Get the current authenticated user from the JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,7 +30,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         raise credentials_exception
     
     # Get user from database
-    user = get_recruiter_by_email(db, email)
+    user = await get_recruiter_by_email(db, email)
     if user is None:
         raise credentials_exception
     
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from app.models.models import Job
+from sqlalchemy import update, func
+from app.models.models import Job, Score, Resume, Candidate
 from app.schemas.schemas import JobCreate, JobUpdate
 from typing import List, Optional, Dict, Any
 
@@ -56,4 +57,43 @@ def delete_job(db: Session, job_id: int):
         db.delete(db_job)
         db.commit()
         return True
-    return False 
\ No newline at end of file
+    return False 
+
+
+def rescore_job(db: Session, job_id: int, weighting: Dict[str, float]):
+    """Recompute weighted totals for every scored resume of a job in one UPDATE."""
+    result = db.execute(
+        update(Score)
+        .where(
+            Score.job_id == job_id,
+            Score.education_score.isnot(None),
+            Score.experience_score.isnot(None),
+            Score.skills_score.isnot(None),
+        )
+        .values(score=(
+            Score.education_score * weighting["education"]
+            + Score.skills_score * weighting["skills"]
+            + Score.experience_score * weighting["experience"]
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    rankings = (
+        db.query(
+            func.rank().over(order_by=Score.score.desc()).label("rank"),
+            Resume.candidate_id,
+            Score.resume_id,
+            Candidate.name,
+            Score.score,
+            Score.skills_score,
+            Score.experience_score,
+            Score.education_score,
+        )
+        .join(Resume, Resume.resume_id == Score.resume_id)
+        .outerjoin(Candidate, Candidate.candidate_id == Resume.candidate_id)
+        .filter(Score.job_id == job_id, Score.skills_score.isnot(None))
+        .order_by(Score.score.desc())
+        .all()
+    )
+    return result.rowcount, rankings
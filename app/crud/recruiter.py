@@ -1,23 +1,26 @@
-from sqlalchemy.orm import Session
+import asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.models.models import Recruiter
 from app.schemas.schemas import RecruiterCreate
 from app.core.security import get_password_hash, verify_password
 
-def get_recruiter(db: Session, recruiter_id: int):
+async def get_recruiter(db: AsyncSession, recruiter_id: int):
     """Get a recruiter by ID."""
-    return db.query(Recruiter).filter(Recruiter.id == recruiter_id).first()
+    return await db.get(Recruiter, recruiter_id)
 
-def get_recruiter_by_email(db: Session, email: str):
+async def get_recruiter_by_email(db: AsyncSession, email: str):
     """Get a recruiter by email."""
-    return db.query(Recruiter).filter(Recruiter.email == email).first()
+    result = await db.execute(select(Recruiter).where(Recruiter.email == email).limit(1))
+    return result.scalars().first()
 
-def create_recruiter(db: Session, recruiter: RecruiterCreate):
+async def create_recruiter(db: AsyncSession, recruiter: RecruiterCreate):
     """Create a new recruiter."""
-    # Hash the password
-    hashed_password = get_password_hash(recruiter.password)
-    
+    # Hash the password off the event loop, bcrypt is deliberately slow
+    hashed_password = await asyncio.to_thread(get_password_hash, recruiter.password)
+
     # Create the recruiter model instance
     db_recruiter = Recruiter(
         firstname=recruiter.firstname,
@@ -25,21 +28,21 @@ def create_recruiter(db: Session, recruiter: RecruiterCreate):
         email=recruiter.email,
         password=hashed_password
     )
-    
+
     # Add and commit to the database
     db.add(db_recruiter)
-    db.commit()
-    db.refresh(db_recruiter)
-    
+    await db.commit()
+    await db.refresh(db_recruiter)
+
     return db_recruiter
 
-def authenticate_recruiter(db: Session, email: str, password: str) -> Optional[Recruiter]:
+async def authenticate_recruiter(db: AsyncSession, email: str, password: str) -> Optional[Recruiter]:
     """Authenticate a recruiter by email and password."""
     # Get the recruiter by email
-    recruiter = get_recruiter_by_email(db, email)
-    
+    recruiter = await get_recruiter_by_email(db, email)
+
     # If recruiter doesn't exist or password is incorrect, return None
-    if not recruiter or not verify_password(password, recruiter.password):
+    if not recruiter or not await asyncio.to_thread(verify_password, password, recruiter.password):
         return None
-    
-    return recruiter 
\ No newline at end of file
+
+    return recruiter
@@ -1,17 +1,43 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # Get database URL from environment variable or use default
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:password@db:5432/talentmatch")
 
+# Connection pool settings, shared by the sync and async engines
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+def to_async_url(url):
+    """Swap the driver of a postgresql:// URL for asyncpg"""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# Defaults to DATABASE_URL with the asyncpg driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
 # Print the database URL for debugging
 print(f"Connecting to database: {DATABASE_URL}")
 
-engine = create_engine(DATABASE_URL)
+pool_settings = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+    "pool_recycle": DB_POOL_RECYCLE,
+}
+
+engine = create_engine(DATABASE_URL, **pool_settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for endpoints that run on the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_settings)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency to get DB session
@@ -20,4 +46,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,24 +1,101 @@
 from difflib import SequenceMatcher
 from statistics import mean
+import numpy as np
+import os
+from app.job_matcher.skill_registry import skill_registry
 
-def calculate_score(resume_skills, job_description, Skills):
-    resume_skills = set(x.lower() for x in resume_skills)
-    job_skills = set(x.lower() for x in job_description[Skills])
+# Minimum similarity for a partial (fuzzy) skill match
+FUZZY_MATCH_THRESHOLD = 0.7
+# Pairs whose character-overlap bound reaches (threshold - tolerance) are
+# confirmed with SequenceMatcher. The bound never underestimates the ratio,
+# so the default loses no match; a larger value only confirms more pairs.
+FUZZY_MATCH_TOLERANCE = float(os.getenv("FUZZY_MATCH_TOLERANCE", "0"))
 
-    matched_skills = job_skills.intersection(resume_skills)
-    exact_match_score = len(matched_skills) / len(job_skills) if job_skills else 0
+class SkillMatcher:
+    """
+    Fuzzy matcher for one job's skill list.
 
-    partial_scores = []
-    unmatched_job_skills = job_skills - matched_skills
-    unmatched_resume_skills = resume_skills - matched_skills
+    Each job skill is encoded once as a character count vector. A resume's
+    skills are scored against all job skills at once with the shared
+    character count (SequenceMatcher.quick_ratio), an upper bound of the
+    SequenceMatcher ratio. Every pair whose bound reaches the cutoff is then
+    confirmed with SequenceMatcher, so the accepted scores are exactly those
+    of the pairwise loop.
+    """
+
+    def __init__(self, job_skills, threshold=FUZZY_MATCH_THRESHOLD, tolerance=FUZZY_MATCH_TOLERANCE):
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.job_skills = sorted(skill_registry.canonicalize(job_skills))
+        self.index = {skill: row for row, skill in enumerate(self.job_skills)}
+
+        self.vocabulary = {char: col for col, char in enumerate(sorted(set("".join(self.job_skills))))}
+        self.job_counts = self._encode(self.job_skills)
+        self.job_lengths = np.array([len(skill) for skill in self.job_skills], dtype=np.float64)
+
+    def _encode(self, skills):
+        # Characters no job skill contains can never be shared, so they are not counted
+        counts = np.zeros((len(skills), len(self.vocabulary)), dtype=np.int32)
+        for row, skill in enumerate(skills):
+            for char in skill:
+                col = self.vocabulary.get(char)
+                if col is not None:
+                    counts[row, col] += 1
+        return counts
+
+    def partial_scores(self, job_skills, resume_skills):
+        """Best above-threshold similarity for each job skill against the resume skills"""
+        job_skills = [skill for skill in job_skills if skill in self.index]
+        resume_skills = list(resume_skills)
+        if not job_skills or not resume_skills:
+            return []
+
+        rows = [self.index[skill] for skill in job_skills]
+        resume_counts = self._encode(resume_skills)
+        resume_lengths = np.array([len(skill) for skill in resume_skills], dtype=np.float64)
+
+        shared = np.minimum(self.job_counts[rows][:, None, :], resume_counts[None, :, :]).sum(axis=2)
+        lengths = self.job_lengths[rows][:, None] + resume_lengths[None, :]
+        # Two empty strings are identical, as SequenceMatcher rates them
+        bounds = np.where(lengths > 0, 2.0 * shared / np.maximum(lengths, 1), 1.0)
 
-    if unmatched_job_skills and unmatched_resume_skills:
+        scores = []
+        for job_skill, row_bounds in zip(job_skills, bounds):
+            candidates = np.flatnonzero(row_bounds >= self.threshold - self.tolerance)
+            if not len(candidates):
+                continue
+            best = max(SequenceMatcher(None, job_skill, resume_skills[col]).ratio() for col in candidates)
+            if best > self.threshold:
+                scores.append(best)
+        return scores
+
+def build_skill_matchers(job_description, sections=("hard_skills", "soft_skills")):
+    """Precompute a SkillMatcher per skill section of a job description"""
+    return {section: SkillMatcher(job_description.get(section, [])) for section in sections}
+
+def calculate_score(resume_skills, job_description, Skills, matcher=None):
+    # Exact matching runs on canonical skill IDs so aliases ("js", "javascript") match
+    resume_names = skill_registry.names(resume_skills)
+    job_names = skill_registry.names(job_description[Skills])
+    resume_ids, job_ids = resume_names.keys(), job_names.keys()
+
+    matched_ids = job_ids & resume_ids
+    exact_match_score = len(matched_ids) / len(job_ids) if job_ids else 0
+
+    matched_skills = {job_names[sid] for sid in matched_ids}
+    unmatched_job_skills = {job_names[sid] for sid in job_ids - matched_ids}
+    unmatched_resume_skills = {resume_names[sid] for sid in resume_ids - matched_ids}
+
+    partial_scores = []
+    if unmatched_job_skills and unmatched_resume_skills and matcher is not None:
+        partial_scores = matcher.partial_scores(unmatched_job_skills, unmatched_resume_skills)
+    elif unmatched_job_skills and unmatched_resume_skills:
         for job_skill in unmatched_job_skills:
             best_similarity = max(
                 SequenceMatcher(None, job_skill, resume_skill).ratio()
                 for resume_skill in unmatched_resume_skills
             )
-            if best_similarity > 0.7:
+            if best_similarity > FUZZY_MATCH_THRESHOLD:
                 partial_scores.append(best_similarity)
 
     partial_match_score = mean(partial_scores) if partial_scores else 0
@@ -27,13 +104,14 @@ def calculate_score(resume_skills, job_description, Skills):
         'total_score': score,
         'matched_skills': list(matched_skills),
         'missing_skills': list(unmatched_job_skills),
-        'extra_skills': list(resume_skills - job_skills),
+        'extra_skills': list(unmatched_resume_skills),
     }
 
-def calculate_skills_score(resume_data, job_description):
+def calculate_skills_score(resume_data, job_description, matchers=None):
+    matchers = matchers or {}
     # Calculate individual section scores
-    technical_skills_score = calculate_score(resume_data['hard_skills'], job_description,'hard_skills')
-    soft_skills_score = calculate_score(resume_data['soft_skills'], job_description,'soft_skills')
+    technical_skills_score = calculate_score(resume_data['hard_skills'], job_description,'hard_skills', matchers.get('hard_skills'))
+    soft_skills_score = calculate_score(resume_data['soft_skills'], job_description,'soft_skills', matchers.get('soft_skills'))
 
     # Combine technical and soft skills scores with adjustable weights
     technical_weight: float = 0.8 
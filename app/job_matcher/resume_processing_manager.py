@@ -1,8 +1,4 @@
-import os
 import logging
-from app.services.s3_process_resumes import s3_process_resumes
-from app.job_matcher.resume_processor import ResumeProcessor
-from app.models.models import Resume
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -23,24 +19,9 @@ def get_job_description_text(job_description):
                 text += key + ": " + ', '.join(job_description[key]) + "\n" 
     return text
 
-async def process_all_resumes(job_id, resume_s3_keys, job_description_data, weighting, db_session):
-    logger.info(f"Starting async resume processing for job_id={job_id} with {len(resume_s3_keys)} resumes")
-    
-    try:
-        # Process job description
-        job_text = get_job_description_text(job_description_data)
-        
-        manager = ResumeProcessor(job_text, job_description_data, weighting)
-        process = s3_process_resumes(db_session=db_session,job_id=job_id)
+def create_resume_processor(job_description_data, weighting):
+    # Imported on first use: the processor pulls in LangChain, the LLM client and numpy
+    from app.job_matcher.resume_processor import ResumeProcessor
 
-        return process.process_s3_resumes(resume_s3_keys, manager)
-    
-    except Exception as e:
-        logger.exception(f"Error in process_all_resumes: {str(e)}")
-        return {
-            "error": str(e),
-            "total_files": len(resume_s3_keys) if resume_s3_keys else 0,
-            "processed_files": 0,
-            "failed_files": 0
-        }
-    
+    job_text = get_job_description_text(job_description_data)
+    return ResumeProcessor(job_text, job_description_data, weighting)
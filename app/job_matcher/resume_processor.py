@@ -1,8 +1,14 @@
-from app.job_matcher.utils.bias_free_resume import ResumeAnonymizerPersonalData
-from app.job_matcher.matching_skills import calculate_skills_score
-from app.job_matcher.utils.prompt import COMBINED_PROMPT, SUMMARY_RESUME_PROMPT
-from app.job_matcher.utils.globals import LLM
-from langchain_core.output_parsers import JsonOutputParser
+from app.job_matcher.utils.bias_free_resume import resume_anonymizer
+from app.job_matcher.matching_skills import calculate_skills_score, build_skill_matchers
+from app.job_matcher.utils.prompt import RESUME_ANALYSIS_PROMPT
+from app.job_matcher.utils.globals import get_llm, LLM_CACHE_MODEL_NAME
+from app.job_matcher.utils.llm_cache import llm_cache
+from app.job_matcher.utils.rate_limiter import llm_rate_limiter, estimate_tokens, LLMRateLimited
+from app.job_matcher.utils.text_compactor import resume_compactor
+from app.schemas.schemas import ResumeAnalysis
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import ValidationError
+import asyncio
 import logging
 
 # Set up logging
@@ -11,84 +17,167 @@ logger = logging.getLogger(__name__)
 class ResumeProcessor:
 
     def __init__(self, job_descreption, original_job_description, weighting):
-        self.anonymizer = ResumeAnonymizerPersonalData()
+        # Stateless, so every processor shares the one compiled instance
+        self.anonymizer = resume_anonymizer
         self.original_job_description = original_job_description
         self.weighting = weighting
-        self.parser = JsonOutputParser()
+        self.parser = PydanticOutputParser(pydantic_object=ResumeAnalysis)
         self.job_descreption = job_descreption
+        # Job skills are encoded once and reused for every resume
+        self.skill_matchers = build_skill_matchers(original_job_description)
     
     def process_single_resume(self, resume_text):
         try:
-            result, data, personale_data = self.process_resume(resume_text)
-            
-            if result and data and personale_data:
-
-                # Calculate comprehensive score
-                data_skills = calculate_skills_score(data['skills'], self.original_job_description)
+            analysis, personale_data, compacted = self.process_resume(resume_text)
+            return self.build_result(analysis, personale_data, compacted)
                 
-                education_score = float(result['education']['match_percentage'].strip("%"))
-                experience_score = float(result['experience']['match_percentage'].strip("%"))
-                skills_score = data_skills['match_percentage']
-                            
-                # Calculate weighted score
-                weighted_score = (
-                    (education_score * self.weighting['education']) + 
-                    (skills_score * self.weighting['skills']) + 
-                    (experience_score * self.weighting['experience'])
-                )
-
-                # Prepare data extracted for database
-                data_extracted = {
-                    'name':personale_data['name'],
-                    'email':personale_data['email'],
-                    'phone_number':personale_data['phone_number'],
-                    'skills': data['skills'],
-                    'education': result['education'],
-                    'experience': result['experience'],
-                    'matched_skills': data_skills['matched_skills'],
-                    'missing_skills': data_skills['missing_skills'],
-                    'extra_skills': data_skills['extra_skills'],
-                    'ScoreEducation': education_score,
-                    'ScoreExperience': experience_score,
-                    'ScoreSkills': skills_score,
-                    'totalScore': weighted_score,
-                    'summary': data['summary']
-                }
+        except LLMRateLimited:
+            # Not a problem with this resume: the caller retries it later
+            raise
+        except Exception as e:
+            logger.exception(f"Error processing resume: {str(e)}")
+            return None
 
-                return data_extracted
-            else:
-                logger.error(f"Error: AI processing failed")
-                return None
-                
+    async def aprocess_single_resume(self, resume_text):
+        try:
+            analysis, personale_data, compacted = await self.aprocess_resume(resume_text)
+            return self.build_result(analysis, personale_data, compacted)
+
+        except LLMRateLimited:
+            raise
         except Exception as e:
             logger.exception(f"Error processing resume: {str(e)}")
             return None
 
+    def build_result(self, analysis: ResumeAnalysis, personale_data, compacted=None):
+        if analysis and personale_data:
+            skills = analysis.skills.model_dump()
+
+            # Calculate comprehensive score
+            data_skills = calculate_skills_score(skills, self.original_job_description, self.skill_matchers)
+            
+            education_score = analysis.education.match_percentage
+            experience_score = analysis.experience.match_percentage
+            skills_score = data_skills['match_percentage']
+                        
+            # Calculate weighted score
+            weighted_score = (
+                (education_score * self.weighting['education']) + 
+                (skills_score * self.weighting['skills']) + 
+                (experience_score * self.weighting['experience'])
+            )
+
+            # Prepare data extracted for database; unset fields are left out, as
+            # they were in the raw LLM JSON the storage code was written for
+            data_extracted = {
+                'name':personale_data.name,
+                'email':personale_data.email,
+                'phone_number':personale_data.phone_number,
+                'skills': skills,
+                'education': analysis.education.model_dump(exclude_none=True),
+                'experience': analysis.experience.model_dump(exclude_none=True),
+                'matched_skills': data_skills['matched_skills'],
+                'missing_skills': data_skills['missing_skills'],
+                'extra_skills': data_skills['extra_skills'],
+                'ScoreEducation': education_score,
+                'ScoreExperience': experience_score,
+                'ScoreSkills': skills_score,
+                'totalScore': weighted_score,
+                'summary': analysis.summary
+            }
+            if compacted is not None:
+                # Reported with the resume's progress events, not stored
+                data_extracted['compaction'] = {
+                    'original_tokens': compacted.original_tokens,
+                    'compacted_tokens': compacted.compacted_tokens,
+                    'tokens_saved': compacted.tokens_saved,
+                    'truncated': compacted.truncated,
+                }
+
+            return data_extracted
+        else:
+            logger.error(f"Error: AI processing failed")
+            return None
+
+    def prepare_llm_inputs(self, resume_text):
+        personale_data = self.anonymizer.get_data(resume_text)
+        resume_text = self.anonymizer.anonymize_text(resume_text, personale_data)
+        # Drop page furniture and fit long resumes into the token budget
+        compacted = resume_compactor.compact(resume_text)
+
+        data_llm = {"resume_text": compacted.text, "job_description": self.job_descreption}
+        return data_llm, personale_data, compacted
 
     def process_resume(self, resume_text):
         logger.info(f"Starting resume processing with AI.")
         
         try:
-            personale_data = self.anonymizer.get_data(resume_text)
-            resume_text = self.anonymizer.anonymize_text(resume_text, personale_data)
-            
-            data_llm = {"resume_text": resume_text, "job_description": self.job_descreption}
-            data = self.parse_resume_with_llm(data_llm, COMBINED_PROMPT)
-            
-            summary = self.parse_resume_with_llm({"resume_text": resume_text}, SUMMARY_RESUME_PROMPT)
+            data_llm, personale_data, compacted = self.prepare_llm_inputs(resume_text)
+            analysis = self.parse_resume_with_llm(data_llm, RESUME_ANALYSIS_PROMPT)
 
-            return data, summary, personale_data
+            return analysis, personale_data, compacted
         
+        except LLMRateLimited:
+            raise
+        except Exception as e:
+            logger.exception(f"Error in resume processing\n {str(e)}")
+            return None, None, None
+
+    async def aprocess_resume(self, resume_text):
+        logger.info(f"Starting async resume processing with AI.")
+
+        try:
+            data_llm, personale_data, compacted = self.prepare_llm_inputs(resume_text)
+            analysis = await self.aparse_resume_with_llm(data_llm, RESUME_ANALYSIS_PROMPT)
+
+            return analysis, personale_data, compacted
+
+        except LLMRateLimited:
+            raise
         except Exception as e:
             logger.exception(f"Error in resume processing\n {str(e)}")
             return None, None, None
 
+    def from_cache(self, cached):
+        """Validated analysis from a cached response, or None if it no longer fits the schema"""
+        if cached is None:
+            return None
+        try:
+            return ResumeAnalysis.model_validate(cached)
+        except ValidationError:
+            return None
+
     def parse_resume_with_llm(self, data, thePrompt):
-        LangChain = thePrompt | LLM | self.parser
+        cache_key = llm_cache.make_key(thePrompt, data, LLM_CACHE_MODEL_NAME)
+        cached = self.from_cache(llm_cache.get(cache_key))
+        if cached is not None:
+            return cached
+
+        LangChain = thePrompt | get_llm() | self.parser
         try:
-            response = LangChain.invoke(data)
-            return response
-            
+            response = llm_rate_limiter.run(lambda: LangChain.invoke(data), estimate_tokens(thePrompt.format(**data)))
+        except LLMRateLimited:
+            raise
+        except Exception as e:
+            raise Exception("Parsed resume contains no meaningful data")
+
+        llm_cache.set(cache_key, LLM_CACHE_MODEL_NAME, response.model_dump())
+        return response
+
+    async def aparse_resume_with_llm(self, data, thePrompt):
+        cache_key = llm_cache.make_key(thePrompt, data, LLM_CACHE_MODEL_NAME)
+        cached = self.from_cache(await asyncio.to_thread(llm_cache.get, cache_key))
+        if cached is not None:
+            return cached
+
+        LangChain = thePrompt | get_llm() | self.parser
+        try:
+            # Waits for rate-limit capacity and retries 429s and transient errors
+            response = await llm_rate_limiter.arun(lambda: LangChain.ainvoke(data), estimate_tokens(thePrompt.format(**data)))
+        except LLMRateLimited:
+            raise
         except Exception as e:
             raise Exception("Parsed resume contains no meaningful data")
-    
\ No newline at end of file
+
+        await asyncio.to_thread(llm_cache.set, cache_key, LLM_CACHE_MODEL_NAME, response.model_dump())
+        return response
@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(__file__), "utils", "skill_aliases.json")
+SKILL_ALIASES_PATH = os.getenv("SKILL_ALIASES_PATH", DEFAULT_ALIASES_PATH)
+
+_WHITESPACE = re.compile(r"\s+")
+# Separators that do not change what a skill means ("node.js", "node js", "nodejs")
+_SEPARATORS = re.compile(r"[\s.\-_]+")
+
+def normalize_skill(skill):
+    """Lowercase, trim and collapse whitespace"""
+    return _WHITESPACE.sub(" ", str(skill).strip().lower()).strip(" ,;:")
+
+def _index_key(skill):
+    normalized = normalize_skill(skill)
+    compact = _SEPARATORS.sub("", normalized)
+    # Fall back to the normalized form for skills made only of separators
+    return compact or normalized
+
+def skill_id(canonical_name):
+    """Stable 63-bit ID for a canonical skill name, identical across processes"""
+    digest = hashlib.blake2b(canonical_name.encode("utf-8"), digest_size=8).digest()
+    # Masked to fit a signed BIGINT column
+    return int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF
+
+class SkillRegistry:
+    """
+    Canonical skill vocabulary.
+
+    Aliases ("js", "java script") resolve through a hash index on a
+    separator-insensitive key to one canonical name and integer ID. Skills
+    that are not in the vocabulary get the ID of their normalized form,
+    computed on each use and never stored, so the registry only ever holds
+    the vocabulary however many distinct skills the LLM extracts. An ID that
+    collides with a different vocabulary skill is rejected, never merged.
+    Stored Resume.skill_ids go stale when the alias table changes; rerun
+    app.scripts.recompute_skill_ids after changing it.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path):
+        registry = cls()
+        try:
+            registry.load(path)
+        except Exception as e:
+            logger.exception(f"Could not load skill aliases from {path}: {str(e)}")
+        return registry
+
+    def load(self, source):
+        """Load a {canonical: [aliases]} mapping from a dict or a JSON file path"""
+        if isinstance(source, dict):
+            vocabulary = source
+        else:
+            with open(source, "r", encoding="utf-8") as file:
+                vocabulary = json.load(file)
+
+        with self._lock:
+            for canonical, aliases in vocabulary.items():
+                canonical = normalize_skill(canonical)
+                sid = self._register(canonical)
+                if sid is None:
+                    continue
+                for alias in aliases:
+                    self._index[_index_key(alias)] = sid
+        logger.info(f"Loaded {len(vocabulary)} canonical skills")
+
+    def _register(self, canonical):
+        sid = skill_id(canonical)
+        existing = self._names.get(sid)
+        if existing and existing != canonical:
+            logger.error(f"Skill ID collision between '{existing}' and '{canonical}', skipping '{canonical}'")
+            return None
+        self._names[sid] = canonical
+        self._index[_index_key(canonical)] = sid
+        return sid
+
+    def lookup(self, skill):
+        """ID of a known skill or alias, or None"""
+        return self._index.get(_index_key(skill))
+
+    def resolve(self, skill):
+        """
+        (ID, canonical name) of a skill, or None for an empty one.
+
+        Unknown skills resolve to their normalized form without being
+        registered. None is also returned, with a warning, when that form's
+        ID belongs to a different vocabulary skill.
+        """
+        normalized = normalize_skill(skill) if skill else ""
+        if not normalized:
+            return None
+        sid = self.lookup(normalized)
+        if sid is not None:
+            return sid, self._names[sid]
+
+        sid = skill_id(normalized)
+        existing = self._names.get(sid)
+        if existing is not None and existing != normalized:
+            logger.warning(f"Skill ID collision between '{existing}' and '{normalized}', ignoring '{normalized}'")
+            return None
+        return sid, normalized
+
+    def name(self, sid):
+        """Canonical name of a vocabulary skill ID"""
+        return self._names.get(sid)
+
+    def canonical(self, skill):
+        """Canonical name for a skill or alias"""
+        resolved = self.resolve(skill)
+        return resolved[1] if resolved else None
+
+    def names(self, skills):
+        """{ID: canonical name} for a skill list, de-duplicated and in input order"""
+        return dict(resolved for resolved in map(self.resolve, skills) if resolved)
+
+    def to_ids(self, skills):
+        return set(self.names(skills))
+
+    def canonicalize(self, skills):
+        """Canonical names for a skill list, de-duplicated and in input order"""
+        return list(dict.fromkeys(self.names(skills).values()))
+
+# Singleton instance
+skill_registry = SkillRegistry.from_file(SKILL_ALIASES_PATH)
@@ -1,57 +1,83 @@
 import re
 import logging
+from typing import NamedTuple, Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+class PersonalData(NamedTuple):
+    """Personal data extracted from one resume"""
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+
 class ResumeAnonymizerPersonalData:
+    """
+    Extracts and masks personal data in resume text.
+
+    Holds only patterns compiled at construction and keeps no per-resume
+    state: every call returns a new immutable result. One instance can be
+    shared by any number of threads, and pickles for process pools.
+    """
+
     def __init__(self):
         self.bias_sensitive_terms = {
-            'gender_markers': ['he/him', 'she/her', 'they/them'],
-            'age_indicators': ['years old', 'age:', 'DOB:', 'date of birth'],
-            'marital_status': ['married', 'single', 'divorced', 'widowed'],
-            'nationality_markers': ['citizenship', 'nationality'],
-            'protected_characteristics': ['race', 'ethnicity', 'religion', 'sexual orientation', 'disability status']
+            'gender_markers': ('he/him', 'she/her', 'they/them'),
+            'age_indicators': ('years old', 'age:', 'DOB:', 'date of birth'),
+            'marital_status': ('married', 'single', 'divorced', 'widowed'),
+            'nationality_markers': ('citizenship', 'nationality'),
+            'protected_characteristics': ('race', 'ethnicity', 'religion', 'sexual orientation', 'disability status')
         }
-        self.info = {'name': None, 'email': None, 'phone_number': None}
 
-        self.pattern_name = r'\b[A-Z][a-z]*\s+[A-Z][a-z]*\b|\b[A-Z]+(?:\s+[A-Z]+)+\b'
-        self.pattern_email = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        self.pattern_phone = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+        self.pattern_name = re.compile(r'\b[A-Z][a-z]*\s+[A-Z][a-z]*\b|\b[A-Z]+(?:\s+[A-Z]+)+\b')
+        self.pattern_email = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+        self.pattern_phone = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
 
-    def get_data(self, text):
+        # All bias-sensitive terms as one alternation, longest first so a term
+        # never loses to a shorter one starting at the same position. Sharing
+        # the word boundaries keeps the regex engine from retrying every branch
+        # at every position.
+        terms = sorted(
+            (term for group in self.bias_sensitive_terms.values() for term in group),
+            key=len, reverse=True
+        )
+        self.pattern_terms = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b', re.IGNORECASE)
+
+    def get_data(self, text) -> PersonalData:
         try:
-            # Extract personal data
-            self.info['name'] = self.extract_data(text, self.pattern_name)
-            self.info['email'] = self.extract_data(text, self.pattern_email)
-            self.info['phone_number'] = self.extract_data(text, self.pattern_phone)
-            
-            return self.info
-        
+            return PersonalData(
+                name=self.extract_data(text, self.pattern_name),
+                email=self.extract_data(text, self.pattern_email),
+                phone_number=self.extract_data(text, self.pattern_phone),
+            )
+
         except Exception as e:
             logger.exception("Error during data extraction")
-            return self.info
+            return PersonalData()
 
     def extract_data(self, text, pattern):
-        matches = re.search(pattern, text)
+        matches = pattern.search(text)
         return matches[0] if matches else None
 
-    def anonymize_text(self, text, data):
-        try:
-            working_text = text
-
-            # Replace personal information
-            for key, value in data.items():
-                if value:
-                    working_text = re.sub(re.escape(value), '[anonym]', working_text, flags=re.IGNORECASE)
-
-            # Replace bias-sensitive terms
-            for terms in self.bias_sensitive_terms.values():
-                for term in terms:
-                    working_text = re.sub(r'\b' + re.escape(term) + r'\b', '[anonym]', working_text, flags=re.IGNORECASE)
+    def values_pattern(self, data: PersonalData):
+        """The extracted personal values as one alternation, or None if there are none"""
+        values = sorted({value for value in data if value}, key=len, reverse=True)
+        if not values:
+            return None
+        # Only a few escaped literals, so compiling per resume is cheap
+        return re.compile('|'.join(re.escape(value) for value in values), re.IGNORECASE)
 
-            return working_text
+    def anonymize_text(self, text, data: PersonalData):
+        try:
+            # Personal values first, then the bias-sensitive terms compiled at construction
+            pattern_values = self.values_pattern(data)
+            if pattern_values is not None:
+                text = pattern_values.sub('[anonym]', text)
+            return self.pattern_terms.sub('[anonym]', text)
 
         except Exception as e:
             logger.exception("Error during anonymization")
             return text
+
+# Singleton instance, shared by every resume processor
+resume_anonymizer = ResumeAnonymizerPersonalData()
@@ -0,0 +1,133 @@
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+from typing import Any, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.job_matcher.skill_registry import skill_registry
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Markers that tell the prompts apart and precede the text each one embeds
+JOB_DESCRIPTION_MARKER = "### Job Description:"
+COMBINED_RESUME_MARKER = "### Candidate's Resume:"
+SUMMARY_RESUME_MARKER = "Resume:"
+
+SOFT_SKILLS = ("leadership", "communication", "teamwork", "mentoring", "problem solving", "collaboration")
+_WORDS = re.compile(r"[a-z0-9+#][a-z0-9+#.\-]*")
+MAX_SKILL_WORDS = 3
+
+def find_skills(text):
+    """Canonical names of the registry skills mentioned in a text, in order of appearance"""
+    words = [word.rstrip(".") for word in _WORDS.findall(text.lower())]
+    # Each distinct phrase of up to MAX_SKILL_WORDS words is looked up once
+    phrases = dict.fromkeys(words)
+    for length in range(2, MAX_SKILL_WORDS + 1):
+        phrases.update(dict.fromkeys(map(" ".join, zip(*(words[offset:] for offset in range(length))))))
+    found = dict.fromkeys(sid for sid in map(skill_registry.lookup, phrases) if sid is not None)
+    return [skill_registry.name(sid) for sid in found]
+
+class FakeResumeLLM(BaseChatModel):
+    """
+    Local stand-in for the hosted LLM, for load testing and profiling.
+
+    Answers RESUME_ANALYSIS_PROMPT, COMBINED_PROMPT and SUMMARY_RESUME_PROMPT
+    with JSON in the shape each asks for, after a configurable delay. Output
+    and delay are derived from a hash of the prompt, so the same resume always
+    gets the same answer. Skills are the registry skills that actually appear
+    in the text, so skill matching downstream does real work.
+    """
+
+    latency_seconds: float = 1.0
+    # Delay varies uniformly by up to this fraction of latency_seconds
+    latency_jitter: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-resume"
+
+    def _rng(self, prompt):
+        return random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+
+    def _delay(self, rng):
+        return max(0.0, self.latency_seconds * (1 + rng.uniform(-self.latency_jitter, self.latency_jitter)))
+
+    def respond(self, prompt, rng):
+        if COMBINED_RESUME_MARKER in prompt:
+            head, resume_text = prompt.rsplit(COMBINED_RESUME_MARKER, 1)
+            job_description = head.rsplit(JOB_DESCRIPTION_MARKER, 1)[-1]
+            response = self.combined_response(resume_text, job_description, rng)
+            if '"summary"' in head:
+                # RESUME_ANALYSIS_PROMPT: everything in one object, percentages as numbers
+                response.update(self.summary_response(resume_text, rng))
+                for section in ("education", "experience"):
+                    response[section]["match_percentage"] = int(response[section]["match_percentage"].rstrip("%"))
+            return response
+        return self.summary_response(prompt.rsplit(SUMMARY_RESUME_MARKER, 1)[-1], rng)
+
+    def combined_response(self, resume_text, job_description, rng):
+        job_skills = set(find_skills(job_description))
+        overlap = len(job_skills & set(find_skills(resume_text))) / len(job_skills) if job_skills else 0.5
+        years = rng.randint(1, 12)
+        return {
+            "education": {
+                "degree": rng.choice(["BSc", "MSc", "PhD"]),
+                "field": rng.choice(["Computer Science", "Software Engineering", "Mathematics"]),
+                "university": "State University",
+                "year": rng.randint(2000, 2023),
+                "match_percentage": f"{rng.randint(40, 95)}%",
+            },
+            "experience": {
+                "companies": [
+                    {
+                        "name": f"Company {index + 1}",
+                        "role": rng.choice(["Software Engineer", "Data Engineer", "Backend Developer"]),
+                        "years": max(1, years // 2),
+                        "key_achievements": ["Delivered a production service", "Reduced costs by 20%"],
+                    }
+                    for index in range(rng.randint(1, 3))
+                ],
+                "total_years": years,
+                "match_percentage": f"{min(100, round(20 + 75 * overlap) + rng.randint(0, 5))}%",
+            },
+        }
+
+    def summary_response(self, resume_text, rng):
+        lowered = resume_text.lower()
+        hard_skills = find_skills(resume_text)
+        return {
+            "skills": {
+                "hard_skills": hard_skills,
+                "tools": [],
+                "soft_skills": [skill for skill in SOFT_SKILLS if skill in lowered],
+            },
+            "summary": (
+                f"Engineer with {rng.randint(1, 12)} years of experience"
+                + (f" in {', '.join(hard_skills[:5])}" if hard_skills else "")
+                + ", delivering production systems across several teams."
+            ),
+        }
+
+    def _result(self, prompt, rng):
+        content = json.dumps(self.respond(prompt, rng))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = self._rng(prompt)
+        time.sleep(self._delay(rng))
+        return self._result(prompt, rng)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = self._rng(prompt)
+        await asyncio.sleep(self._delay(rng))
+        return self._result(prompt, rng)
@@ -1,14 +1,28 @@
-import pathlib
+import io
 import os
-import docx2txt
-import PyPDF2
+import signal
+import queue
+import pathlib
+import multiprocessing
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Processes extracting resume text; 0 extracts in the calling thread instead
+TEXT_EXTRACTION_PROCESSES = int(os.getenv("TEXT_EXTRACTION_PROCESSES", str(os.cpu_count() or 1)))
+# Seconds a single document may take before its extraction is abandoned
+TEXT_EXTRACTION_TIMEOUT = float(os.getenv("TEXT_EXTRACTION_TIMEOUT", "30"))
+# Pages read from a PDF; anything after this is ignored
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+
 class FileParser:
 
+    def __init__(self, max_pages=PDF_MAX_PAGES):
+        self.max_pages = max_pages
+
     def extract_text_from_file(self, file_path, s3_service=None):
         logger.info(f"Starting text extraction from 'S3 key': {file_path}")
         
@@ -16,17 +30,10 @@ class FileParser:
             if not s3_service:
                 raise ValueError("S3Service must be provided for S3 paths")
             
-            # Download from S3 to temp file and extract text
-            temp_file_path, _ = s3_service.download_file(file_path)
+            # Stream from S3 into a spooled buffer and extract text without a temp file
             extension = pathlib.Path(file_path).suffix.lower()
-            
-            result = self.extract_from_file(temp_file_path, extension)
-            
-            # Clean up the temp file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-                
-            return result
+            with s3_service.open_file(file_path) as fileobj:
+                return self.extract_from_fileobj(fileobj, extension)
         
         except Exception as e:
             logger.exception(f"Error reading file: {e}")
@@ -34,28 +41,151 @@ class FileParser:
         return None
 
     def extract_from_file(self, file_path, extension):
+        with open(file_path, "rb") as file:
+            return self.extract_from_fileobj(file, extension)
+
+    def extract_from_fileobj(self, fileobj, extension):
         if extension == ".pdf":
-            return self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(fileobj)
         elif extension in [".doc", ".docx"]:
-            return docx2txt.process(file_path).strip()
+            import docx2txt
+            return docx2txt.process(fileobj).strip()
         elif extension == ".txt":
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read().strip()
+            return fileobj.read().decode("utf-8").strip()
         else:
             logger.error(f"Unsupported file type: {extension}")
             raise ValueError(f"Unsupported file type: {extension}")
 
-    def extract_text_from_pdf(self, file_path):
-        text = ""
+    def extract_text_from_pdf(self, fileobj):
+        # Parsers are imported on first use, normally only in the extraction processes
+        import PyPDF2
         try:
-            with open(file_path, "rb") as file:
-                reader = PyPDF2.PdfReader(file)
-                num_pages = len(reader.pages)
-                for page in range(num_pages):
-                    page_text = reader.pages[page].extract_text()
-                    text += page_text + "\n"
-        
-            return text.strip()
+            reader = PyPDF2.PdfReader(fileobj)
+            num_pages = len(reader.pages)
+            if num_pages > self.max_pages:
+                logger.warning(f"PDF has {num_pages} pages, extracting the first {self.max_pages}")
+
+            pages = [reader.pages[page].extract_text() for page in range(min(num_pages, self.max_pages))]
+            # Form feeds mark the page breaks, so running headers and footers can be told from body text
+            return "\f".join(pages).strip()
         except Exception as e:
             logger.exception(f"Error with PyPDF2: {e}")
             return ""
+
+def extract_text(source, extension, max_pages=PDF_MAX_PAGES):
+    """Extract text from a document's path or bytes; runs inside the extraction processes"""
+    parser = FileParser(max_pages)
+    if isinstance(source, str):
+        return parser.extract_from_file(source, extension)
+    return parser.extract_from_fileobj(io.BytesIO(source), extension)
+
+def _report_pid(pids):
+    """Extraction process initializer: tell the parent which process to stop if it gets stuck"""
+    pids.put(os.getpid())
+
+class ExtractionProcess:
+    """
+    One extraction process, running one document at a time.
+
+    Each process has its own single-process executor, so a document that
+    gets stuck can be stopped without touching the documents other
+    processes are working on. The process is started on first use and
+    again after being stopped.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self._executor = None
+        self._pids = None
+
+    def submit(self, *args):
+        if self._executor is None:
+            self._pids = self.context.SimpleQueue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self.context,
+                initializer=_report_pid,
+                initargs=(self._pids,),
+            )
+            logger.info("Started a text extraction process")
+        return self._executor.submit(extract_text, *args)
+
+    def stop(self):
+        """Stop the process, even in the middle of a document"""
+        executor, pids = self._executor, self._pids
+        self._executor = self._pids = None
+        if executor is None:
+            return
+        # A stuck process never returns, so kill it instead of waiting on it
+        if not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+        pids.close()
+
+    def shutdown(self):
+        executor, pids = self._executor, self._pids
+        self._executor = self._pids = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            pids.close()
+
+class TextExtractionPool:
+    """
+    Runs PDF and DOCX text extraction in a pool of worker processes.
+
+    Parsing is CPU-bound and holds the GIL, so in a thread it stalls the
+    event loop serving API requests; in processes it also scales with cores.
+    Callers wait for a free process and hand it their document, so a
+    document's timeout only runs while it is being parsed, never while it is
+    queued behind others. A document that exceeds the timeout cannot be
+    interrupted, so its process is stopped and replaced; documents on the
+    other processes are unaffected. Documents that spilled to disk are
+    opened by path in the process; only in-memory ones are copied to it.
+    """
+
+    def __init__(self, processes=TEXT_EXTRACTION_PROCESSES, timeout=TEXT_EXTRACTION_TIMEOUT, max_pages=PDF_MAX_PAGES):
+        self.processes = processes
+        self.timeout = timeout
+        self.max_pages = max_pages
+        # Spawned, not forked: the parent runs an event loop and thread pools
+        context = multiprocessing.get_context("spawn")
+        self._all = [ExtractionProcess(context) for _ in range(max(processes, 0))]
+        # Most recently used first, so a light load keeps reusing warm processes
+        self._idle = queue.LifoQueue()
+        for process in reversed(self._all):
+            self._idle.put(process)
+
+    def extract(self, fileobj, extension):
+        """Extract text from an open document, blocking the calling thread until done"""
+        if extension == ".txt":
+            return fileobj.read().decode("utf-8").strip()
+        if self.processes <= 0:
+            return FileParser(self.max_pages).extract_from_fileobj(fileobj, extension)
+
+        path = getattr(fileobj, "name", None)
+        source = path if isinstance(path, str) and os.path.isfile(path) else fileobj.read()
+
+        process = self._idle.get()
+        try:
+            future = process.submit(source, extension, self.max_pages)
+            try:
+                return future.result(timeout=self.timeout)
+            except TimeoutError:
+                logger.error(f"Text extraction exceeded {self.timeout}s, restarting its extraction process")
+                process.stop()
+                raise TimeoutError(f"Text extraction exceeded {self.timeout}s")
+            except BrokenProcessPool:
+                process.stop()
+                raise
+        finally:
+            self._idle.put(process)
+
+    def shutdown(self):
+        for process in self._all:
+            process.shutdown()
+
+# Singleton instance
+text_extraction_pool = TextExtractionPool()
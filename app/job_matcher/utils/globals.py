@@ -1,10 +1,46 @@
 from decouple import config
 from functools import lru_cache
-from langchain_groq import ChatGroq
 
-@lru_cache(maxsize=None)
-def get_llm():
+LLM_MODEL_NAME = config("LLM_MODEL_NAME", default="llama3-70b-8192")
+LLM_PROVIDER = config("LLM_PROVIDER", default="groq")
+# Responses are cached under this name, so other providers never share groq's entries
+LLM_CACHE_MODEL_NAME = LLM_MODEL_NAME if LLM_PROVIDER == "groq" else f"{LLM_PROVIDER}:{LLM_MODEL_NAME}"
+
+# LLM client factories by provider name, see register_llm_provider
+LLM_PROVIDERS = {}
+
+def register_llm_provider(name):
+    """Register a factory returning a LangChain chat model for LLM_PROVIDER=name"""
+    def decorator(factory):
+        LLM_PROVIDERS[name] = factory
+        return factory
+    return decorator
+
+@register_llm_provider("groq")
+def create_groq_llm():
+    # Imported here so the client library is only loaded once an LLM is needed
+    from langchain_groq import ChatGroq
     GROQ_API_KEY = config("GROQ_API_KEY")
-    return ChatGroq(temperature=0, groq_api_key=GROQ_API_KEY, model_name="llama3-70b-8192")
+    # Retries are scheduled by the LLM rate limiter, not the client
+    return ChatGroq(temperature=0, groq_api_key=GROQ_API_KEY, model_name=LLM_MODEL_NAME, max_retries=0)
+
+@register_llm_provider("fake")
+def create_fake_llm():
+    """Deterministic local stand-in with configurable latency, for load tests"""
+    from app.job_matcher.utils.fake_llm import FakeResumeLLM
+    return FakeResumeLLM(
+        latency_seconds=config("FAKE_LLM_LATENCY_SECONDS", default=1.0, cast=float),
+        latency_jitter=config("FAKE_LLM_LATENCY_JITTER", default=0.2, cast=float),
+    )
+
+@lru_cache(maxsize=None)
+def get_llm(provider=LLM_PROVIDER):
+    """
+    Return the shared LLM client, building it on first use.
 
-LLM = get_llm()
\ No newline at end of file
+    Nothing is constructed at import, so the app starts without provider
+    credentials and only fails when a resume is actually scored.
+    """
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {provider}. Available: {', '.join(sorted(LLM_PROVIDERS))}")
+    return LLM_PROVIDERS[provider]()
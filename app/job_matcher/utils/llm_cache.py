@@ -0,0 +1,160 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from app.db.database import SessionLocal
+from app.models.models import LLMCacheEntry
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_HOURS = int(os.getenv("LLM_CACHE_TTL_HOURS", "720"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+# Run eviction once every N writes rather than on every insert
+LLM_CACHE_EVICT_EVERY = int(os.getenv("LLM_CACHE_EVICT_EVERY", "100"))
+# last_accessed_at only drives LRU eviction, so a hit refreshes it at most this
+# often instead of writing on every lookup
+LLM_CACHE_TOUCH_INTERVAL_HOURS = float(os.getenv("LLM_CACHE_TOUCH_INTERVAL_HOURS", "24"))
+
+class LLMResultCache:
+    """
+    Persistent, content-addressed cache for parsed LLM responses.
+
+    Entries are keyed on a hash of the model name, the prompt template and the
+    prompt's input values. Only the variables a prompt actually uses go into
+    the key, so a prompt of the resume text alone would be shared across jobs.
+    RESUME_ANALYSIS_PROMPT also takes the job description, so its entries,
+    summary and skills included, are reused only when the same resume is
+    scored again for the same job.
+    """
+
+    def __init__(self, session_factory=SessionLocal, ttl_hours=LLM_CACHE_TTL_HOURS,
+                 max_entries=LLM_CACHE_MAX_ENTRIES, enabled=LLM_CACHE_ENABLED,
+                 touch_interval_hours=LLM_CACHE_TOUCH_INTERVAL_HOURS):
+        self.session_factory = session_factory
+        self.ttl = timedelta(hours=ttl_hours)
+        self.touch_interval = timedelta(hours=touch_interval_hours)
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt, inputs, model_name):
+        """Hash the model, prompt template and the inputs the prompt consumes"""
+        payload = {
+            "model": model_name,
+            "template": prompt.template,
+            "inputs": {name: inputs.get(name) for name in sorted(prompt.input_variables)},
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, cache_key):
+        """Return the cached response or None; expired entries count as misses"""
+        if not self.enabled:
+            return None
+
+        db = self.session_factory()
+        try:
+            entry = db.get(LLMCacheEntry, cache_key)
+            now = datetime.utcnow()
+            if entry is None or entry.created_at < now - self.ttl:
+                if entry is not None:
+                    db.delete(entry)
+                    db.commit()
+                self._count(hit=False)
+                return None
+
+            if entry.last_accessed_at is None or entry.last_accessed_at < now - self.touch_interval:
+                entry.last_accessed_at = now
+                db.commit()
+            else:
+                # Nothing to write; end the read-only transaction
+                db.rollback()
+            self._count(hit=True)
+            return entry.response
+
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"LLM cache lookup failed: {str(e)}")
+            self._count(hit=False)
+            return None
+        finally:
+            db.close()
+
+    def set(self, cache_key, model_name, response):
+        """Store a parsed response; failures are logged and never raised"""
+        if not self.enabled or not response:
+            return
+
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            db.merge(LLMCacheEntry(
+                cache_key=cache_key,
+                model_name=model_name,
+                response=response,
+                created_at=now,
+                last_accessed_at=now,
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"LLM cache write failed: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._writes_since_evict += 1
+            should_evict = self._writes_since_evict >= LLM_CACHE_EVICT_EVERY
+            if should_evict:
+                self._writes_since_evict = 0
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones above max_entries"""
+        db = self.session_factory()
+        try:
+            db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.created_at < datetime.utcnow() - self.ttl))
+
+            overflow = (
+                select(LLMCacheEntry.cache_key)
+                .order_by(LLMCacheEntry.last_accessed_at.desc())
+                .offset(self.max_entries)
+            )
+            db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.cache_key.in_(overflow)))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"LLM cache eviction failed: {str(e)}")
+        finally:
+            db.close()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Hit/miss counters for this process"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+# Singleton instance
+llm_cache = LLMResultCache()
@@ -97,3 +97,66 @@ SUMMARY_RESUME_PROMPT = PromptTemplate(
         {resume_text}
     """
 )
+
+# Education, experience, skills and summary in one call, so the resume is
+# sent to the model once. Output is validated against schemas.ResumeAnalysis.
+# COMBINED_PROMPT and SUMMARY_RESUME_PROMPT above are the previous two-call
+# path, kept as the baseline for app/scripts/benchmark_resume_analysis.py.
+# The trade-off: the job-independent summary used to be cached once per
+# resume and reused by every job; it is now part of a job-specific response,
+# so scoring one resume for a second job is a cache miss.
+RESUME_ANALYSIS_PROMPT = PromptTemplate(
+    input_variables=["resume_text", "job_description"],
+    template="""You are a senior talent acquisition specialist with 15 years of experience in technical recruiting. Analyse the candidate's resume against the job description and return one JSON object.
+
+        ### Evaluation Framework
+        1. Education: assess academic credentials and their relevance to the job requirements
+        2. Experience: map professional growth, skill progression, achievement impact and role complexity
+        3. Skills: extract all skills from the entire resume, in lowercase, inferring them from context (e.g., "led a team" → "leadership")
+           - hard_skills: technical skills (e.g., python, java, sql)
+           - tools: software/tools (e.g., git, docker, excel)
+           - soft_skills: interpersonal skills (e.g., teamwork, communication, leadership)
+        4. Summary: one paragraph under 150 words that begins with the candidate's professional title and experience level, then covers core strengths, industry experience and key achievements. Never include personal information such as name, age, gender, address, phone number, email or photos.
+
+        ### Scoring Methodology
+        - match_percentage is a number from 0 to 100
+        - If there is no clear relation to the job, use low scores (1-20)
+
+        ### JSON Output Structure:
+        {{
+            "education": {{
+                "degree": "Precise Degree Title",
+                "field": "Specific Field of Study",
+                "university": "Full University Name",
+                "year": 2023,
+                "match_percentage": 75
+            }},
+            "experience": {{
+                "companies": [
+                    {{
+                        "name": "Company Name",
+                        "role": "Detailed Job Title",
+                        "years": 2,
+                        "key_achievements": ["Specific impact-driven accomplishment", "Quantifiable contribution"]
+                    }}
+                ],
+                "total_years": 2,
+                "match_percentage": 60
+            }},
+            "skills": {{
+                "hard_skills": ["skill1", "skill2"],
+                "tools": ["tool1", "tool2"],
+                "soft_skills": ["skill3", "skill4"]
+            }},
+            "summary": "Single paragraph summary"
+        }}
+
+        Return **only** the JSON object, with no additional text.
+
+        ### Job Description:
+        {job_description}
+
+        ### Candidate's Resume:
+        {resume_text}
+        """
+)
@@ -0,0 +1,291 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Provider quotas; the defaults are Groq's free-tier limits for llama3-70b-8192.
+# 0 disables a limit.
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "6000"))
+# The buckets live in each process, so the quota is split between the
+# processes calling the LLM (the worker replicas) to keep them within it together
+LLM_QUOTA_PROCESSES = max(1, int(os.getenv("LLM_QUOTA_PROCESSES", "1")))
+# Longest a call may wait on the limiter, across its retries, before giving
+# up; kept well below RESUME_TASK_VISIBILITY_TIMEOUT so a waiting task is not
+# handed to another worker
+LLM_MAX_WAIT_SECONDS = float(os.getenv("LLM_MAX_WAIT_SECONDS", "300"))
+# Tokens reserved for the completion on top of the prompt estimate
+LLM_COMPLETION_TOKENS = int(os.getenv("LLM_COMPLETION_TOKENS", "800"))
+# Calls in flight per process adapt between these bounds
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Retries of rate-limited or transient failures: full-jitter backoff of
+# base * 2^attempt seconds, capped, or the provider's Retry-After if longer
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "60"))
+
+CHARS_PER_TOKEN = 4
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Raised by the provider SDKs for network failures, matched by name so no SDK is imported
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+def estimate_tokens(text, completion_tokens=LLM_COMPLETION_TOKENS):
+    """Rough token count of a prompt plus the completion it may produce"""
+    return len(text) // CHARS_PER_TOKEN + completion_tokens
+
+class LLMRateLimited(Exception):
+    """
+    Raised when an LLM call still fails with a retryable error after every
+    retry, or would have to wait longer than allowed for rate-limit capacity.
+    retry_after is the number of seconds after which trying again is worthwhile.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at per_minute / 60 per second.
+
+    reserve() takes the tokens at once and returns how long the caller must
+    wait before using them, so waiters are served in arrival order and the
+    bucket works for threads and coroutines alike. A reservation that would
+    wait longer than max_wait takes nothing.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount, max_wait=None):
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # A single request larger than the bucket would never fit
+            remaining = self.tokens - min(amount, self.capacity)
+            wait = max(0.0, -remaining / self.rate)
+            if max_wait is None or wait <= max_wait:
+                self.tokens = remaining
+            return wait
+
+    def refund(self, amount):
+        """Return tokens taken by a reservation that will not be used"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+class LLMRateLimiter:
+    """
+    Rate limiting and retry scheduling for LLM calls.
+
+    Every call reserves one request and its estimated tokens from the
+    requests/min and tokens/min buckets, this process's share of the
+    provider quota. Calls in flight are capped by an
+    AIMD limit: it grows by about one per limit's worth of successes and
+    halves on a rate-limit response, so a large batch settles near the
+    highest concurrency the provider sustains. A 429 also pauses all calls
+    until its Retry-After has passed; retryable failures are retried with
+    exponential backoff and full jitter. A call that would spend more than
+    max_wait seconds waiting raises LLMRateLimited instead.
+    """
+
+    def __init__(self, requests_per_minute=LLM_REQUESTS_PER_MINUTE, tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+                 min_concurrency=LLM_MIN_CONCURRENCY, max_concurrency=LLM_MAX_CONCURRENCY,
+                 max_retries=LLM_MAX_RETRIES, retry_base=LLM_RETRY_BASE_SECONDS, retry_max=LLM_RETRY_MAX_SECONDS,
+                 processes=LLM_QUOTA_PROCESSES, max_wait=LLM_MAX_WAIT_SECONDS):
+        self.requests = TokenBucket(requests_per_minute / processes)
+        self.tokens = TokenBucket(tokens_per_minute / processes)
+        self.max_wait = max_wait
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._slot_freed = None
+        self._slot_freed_loop = None
+
+    def _try_take_slot(self):
+        with self._lock:
+            if self.in_flight < max(self.min_concurrency, int(self.limit)):
+                self.in_flight += 1
+                return True
+            return False
+
+    def _release_slot(self, succeeded):
+        with self._lock:
+            self.in_flight -= 1
+            if succeeded:
+                self.limit = min(self.max_concurrency, self.limit + 1 / max(self.limit, 1))
+
+    def _reserve(self, tokens, deadline):
+        """Seconds to wait before a call may start; raises if that runs past the deadline"""
+        allowed = max(0.0, deadline - time.monotonic())
+        wait = self._paused_for()
+        taken = []
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if wait > allowed:
+                break
+            bucket_wait = bucket.reserve(amount, allowed)
+            if bucket_wait <= allowed:
+                taken.append((bucket, amount))
+            wait = max(wait, bucket_wait)
+
+        if wait > allowed:
+            for bucket, amount in taken:
+                bucket.refund(amount)
+            with self._lock:
+                self.rejected += 1
+            raise LLMRateLimited(f"LLM call would wait {wait:.0f}s for rate-limit capacity", retry_after=wait)
+        return wait
+
+    def _paused_for(self):
+        with self._lock:
+            return max(0.0, self.paused_until - time.monotonic())
+
+    def retry_delay(self, error, attempt):
+        """
+        Seconds to wait before retrying after an error, or None if it is not retryable.
+
+        A rate-limit response also halves the concurrency limit and pauses
+        every call until its Retry-After.
+        """
+        response = getattr(error, "response", None)
+        status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+        names = {cls.__name__ for cls in type(error).__mro__}
+        if status not in RETRYABLE_STATUS_CODES and not names & RETRYABLE_ERROR_NAMES \
+                and not isinstance(error, (TimeoutError, ConnectionError)):
+            return None
+
+        delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+        if status == 429:
+            retry_after = parse_retry_after(getattr(response, "headers", None))
+            now = time.monotonic()
+            with self._lock:
+                self.throttled += 1
+                # Responses to calls sent before the last decrease say nothing new
+                if now - self.last_decrease > self.retry_base:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self.last_decrease = now
+                # Without a Retry-After, hold everyone off for the base delay
+                pause = retry_after if retry_after is not None else self.retry_base
+                self.paused_until = max(self.paused_until, now + pause)
+            delay = max(delay, pause)
+        return delay
+
+    def _give_up(self, error, attempt, deadline):
+        """Delay before the next attempt, or raise once the error is final"""
+        delay = self.retry_delay(error, attempt)
+        if delay is None:
+            raise error
+        if attempt >= self.max_retries or time.monotonic() + delay > deadline:
+            raise LLMRateLimited(f"LLM call failed after {attempt + 1} attempts: {str(error)}",
+                                 retry_after=max(delay, self._paused_for())) from error
+        with self._lock:
+            self.retries += 1
+        logger.warning(f"LLM call failed on attempt {attempt + 1}, retrying in {delay:.1f}s: {str(error)}")
+        return delay
+
+    async def arun(self, call, tokens):
+        """Await call() under the rate limits, retrying retryable failures"""
+        loop = asyncio.get_running_loop()
+        if self._slot_freed_loop is not loop:
+            # asyncio primitives belong to one loop; callers may run several in turn
+            self._slot_freed, self._slot_freed_loop = asyncio.Condition(), loop
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._reserve(tokens, deadline))
+            while True:
+                async with self._slot_freed:
+                    await self._slot_freed.wait_for(self._try_take_slot)
+                pause = self._paused_for()
+                if not pause:
+                    break
+                # Rate limited while this call waited for a slot: back off with everyone else
+                self._release_slot(False)
+                async with self._slot_freed:
+                    self._slot_freed.notify_all()
+                await asyncio.sleep(pause)
+            succeeded = False
+            try:
+                result = await call()
+                succeeded = True
+                return result
+            except Exception as e:
+                delay = self._give_up(e, attempt, deadline)
+            finally:
+                self._release_slot(succeeded)
+                async with self._slot_freed:
+                    self._slot_freed.notify_all()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def run(self, call, tokens):
+        """
+        Blocking counterpart of arun for synchronous callers.
+
+        Shares the buckets, pauses and retry policy; callers are bounded by
+        their own thread count rather than the adaptive limit.
+        """
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            time.sleep(self._reserve(tokens, deadline))
+            while self._paused_for():
+                time.sleep(self._paused_for())
+            try:
+                return call()
+            except Exception as e:
+                delay = self._give_up(e, attempt, deadline)
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "rejected": self.rejected,
+            }
+
+def parse_retry_after(headers):
+    """Seconds from a Retry-After header given as seconds or an HTTP date"""
+    value = headers.get("retry-after") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Singleton instance
+llm_rate_limiter = LLMRateLimiter()
@@ -0,0 +1,271 @@
+import os
+import re
+import logging
+import threading
+from collections import Counter
+from typing import NamedTuple, List
+from app.job_matcher.utils.rate_limiter import CHARS_PER_TOKEN
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+RESUME_COMPACTION_ENABLED = os.getenv("RESUME_COMPACTION_ENABLED", "true").lower() == "true"
+# Estimated tokens of resume text sent to the LLM; longer resumes are cut down to fit
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+# A line at the top or bottom of this many pages (or of every page, for shorter
+# documents) is page furniture: a running header or footer
+REPEATED_LINE_MIN_COUNT = int(os.getenv("RESUME_REPEATED_LINE_MIN_COUNT", "3"))
+# Lines at each end of a page searched for headers, footers and page numbers
+PAGE_EDGE_LINES = 3
+REPEATED_LINE_MAX_CHARS = 100
+SHORT_LINE_MAX_CHARS = 40
+# Page separator left in the text by file_parser
+PAGE_BREAK = "\f"
+TRUNCATION_MARKER = "[...]"
+
+# Section headings, matched against whole short lines
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "education": ["education", "academic background", "qualifications", "education and training"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "technologies", "tools", "skills and tools"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests"],
+    "references": ["references"],
+}
+# Order in which sections give up space when a resume is over budget: the
+# optional ones are dropped first, then the rest are trimmed, least important first
+SECTION_PRIORITY = ["skills", "experience", "summary", "education", "header", "certifications",
+                    "projects", "other", "languages", "interests", "references"]
+OPTIONAL_SECTIONS = {"languages", "interests", "references"}
+
+_HEADING = re.compile(
+    r"^[\W_]*(" + "|".join(sorted(
+        (re.escape(heading) for headings in SECTION_HEADINGS.values() for heading in headings),
+        key=len, reverse=True,
+    )) + r")[\W_]*$",
+    re.IGNORECASE,
+)
+_HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_PAGE_NUMBER = re.compile(r"^[\W_]*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?[\W_]*$", re.IGNORECASE)
+# "Page 2 of 5" inside a longer header or footer line
+_PAGE_REFERENCE = re.compile(r"\bpage\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?\b", re.IGNORECASE)
+_INLINE_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+
+def estimate_text_tokens(text):
+    return len(text) // CHARS_PER_TOKEN
+
+def estimate_line_tokens(line):
+    # Counted per line, plus the line break, so budgets add up across lines
+    return len(line) // CHARS_PER_TOKEN + 1
+
+class Section(NamedTuple):
+    name: str
+    lines: List[str]
+
+class CompactedResume(NamedTuple):
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    removed_lines: int
+    truncated: bool
+    sections: List[str]
+
+    @property
+    def tokens_saved(self):
+        return self.original_tokens - self.compacted_tokens
+
+class ResumeTextCompactor:
+    """
+    Shrinks extracted resume text before it is sent to the LLM.
+
+    Normalizes whitespace, drops page numbers and the running headers and
+    footers repeated at the top or bottom of each page, splits the text into
+    sections by their headings and, when the result is still over the token
+    budget, drops optional sections and trims the others at line boundaries,
+    least important first. Pages are told apart by the form feeds the file
+    parser puts between them; text without any (DOCX, plain text) has no
+    furniture removed. Keeps only running totals, so one instance is shared
+    by every processor.
+    """
+
+    def __init__(self, token_budget=RESUME_TOKEN_BUDGET, enabled=RESUME_COMPACTION_ENABLED):
+        self.token_budget = token_budget
+        self.enabled = enabled
+        self.resumes = 0
+        self.original_tokens = 0
+        self.compacted_tokens = 0
+        self.truncated = 0
+        self._lock = threading.Lock()
+
+    def normalize_lines(self, text):
+        """Stripped lines with runs of blank lines collapsed to one"""
+        lines = []
+        for line in text.replace("\r", "\n").split("\n"):
+            line = _INLINE_WHITESPACE.sub(" ", line).strip()
+            if line or (lines and lines[-1]):
+                lines.append(line)
+        while lines and not lines[-1]:
+            lines.pop()
+        return lines
+
+    def furniture_key(self, line):
+        # Only page numbers are masked, so "Page 2 of 5" and "Page 3 of 5" footers
+        # match while lines that merely differ in digits (dates) never do
+        return _PAGE_REFERENCE.sub("page #", line.lower())
+
+    def edge_lines(self, page):
+        """Non-blank lines at the top and at the bottom of a page, outermost first"""
+        filled = [index for index, line in enumerate(page) if line]
+        return filled[:PAGE_EDGE_LINES], filled[::-1][:PAGE_EDGE_LINES]
+
+    def remove_page_furniture(self, pages):
+        """
+        Join pages into one list of lines without their page numbers and
+        running headers and footers.
+
+        A line is a header (footer) if it is among the top (bottom) lines of
+        REPEATED_LINE_MIN_COUNT pages, or of every page of a shorter document.
+        Each page is peeled from its edges inwards, stopping at the first line
+        that is neither such a line nor a page number, so body text is never
+        removed however often it repeats. A header's first occurrence is kept.
+        """
+        if len(pages) < 2:
+            return [line for page in pages for line in page]
+
+        edges = [self.edge_lines(page) for page in pages]
+        min_pages = min(REPEATED_LINE_MIN_COUNT, len(pages))
+        counts = [Counter(), Counter()]
+        for page, page_edges in zip(pages, edges):
+            for side, indexes in enumerate(page_edges):
+                counts[side].update({
+                    self.furniture_key(page[index]) for index in indexes
+                    if len(page[index]) <= REPEATED_LINE_MAX_CHARS
+                })
+
+        seen = set()
+        kept = []
+        for page, page_edges in zip(pages, edges):
+            removed = set()
+            for side, indexes in enumerate(page_edges):
+                for index in indexes:
+                    line = page[index]
+                    key = self.furniture_key(line)
+                    if _PAGE_NUMBER.match(line):
+                        removed.add(index)
+                    elif counts[side][key] >= min_pages:
+                        if key in seen:
+                            removed.add(index)
+                        seen.add(key)
+                    else:
+                        break
+
+            for index, line in enumerate(page):
+                # Removed lines must not leave runs of blank lines behind
+                if index not in removed and (line or (kept and kept[-1])):
+                    kept.append(line)
+        while kept and not kept[-1]:
+            kept.pop()
+        return kept
+
+    def split_sections(self, lines):
+        sections = [Section("header", [])]
+        for line in lines:
+            match = _HEADING.match(line) if len(line) <= SHORT_LINE_MAX_CHARS else None
+            if match:
+                sections.append(Section(_HEADING_SECTION[match.group(1).lower()], [line]))
+            else:
+                sections[-1].lines.append(line)
+        return [section for section in sections if any(section.lines)]
+
+    def fit_to_budget(self, sections):
+        """Drop optional sections, then trim the longest ones, until the text fits the budget"""
+        sizes = {index: sum(map(estimate_line_tokens, section.lines)) for index, section in enumerate(sections)}
+
+        rank = {name: position for position, name in enumerate(SECTION_PRIORITY)}
+        for index in sorted(sizes, key=lambda index: rank.get(sections[index].name, rank["other"]), reverse=True):
+            if sum(sizes.values()) <= self.token_budget:
+                break
+            if sections[index].name in OPTIONAL_SECTIONS:
+                del sizes[index]
+
+        # Share what is left so short sections (skills, education) stay whole
+        # and the long ones are cut to equal lengths
+        budget, remaining = self.token_budget, len(sizes)
+        for index in sorted(sizes, key=sizes.get):
+            sizes[index] = min(sizes[index], budget // remaining)
+            budget -= sizes[index]
+            remaining -= 1
+
+        return [
+            Section(section.name, self.truncate_lines(section.lines, sizes[index]))
+            for index, section in enumerate(sections) if index in sizes
+        ]
+
+    def truncate_lines(self, lines, token_limit):
+        """Leading lines of a section within token_limit, marked when cut"""
+        kept, used = [], 0
+        for line in lines:
+            cost = estimate_line_tokens(line)
+            if used + cost > token_limit:
+                # Keep the start of a line too long to fit, e.g. a PDF extracted without line breaks
+                head = line[:(token_limit - used) * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+                kept.extend([head, TRUNCATION_MARKER] if head else [TRUNCATION_MARKER])
+                break
+            kept.append(line)
+            used += cost
+        return kept
+
+    def compact(self, text) -> CompactedResume:
+        original_tokens = estimate_text_tokens(text)
+        if not self.enabled or not text:
+            text = text.replace(PAGE_BREAK, "\n")
+            return CompactedResume(text, original_tokens, original_tokens, 0, False, [])
+
+        pages = [self.normalize_lines(page) for page in text.split(PAGE_BREAK)]
+        lines = [line for page in pages for line in page]
+        kept = self.remove_page_furniture(pages)
+        sections = self.split_sections(kept)
+
+        truncated = sum(map(estimate_line_tokens, kept)) > self.token_budget
+        if truncated:
+            sections = self.fit_to_budget(sections)
+
+        compacted = "\n".join(line for section in sections for line in section.lines)
+        result = CompactedResume(
+            text=compacted,
+            original_tokens=original_tokens,
+            compacted_tokens=estimate_text_tokens(compacted),
+            removed_lines=sum(map(bool, lines)) - sum(map(bool, kept)),
+            truncated=truncated,
+            sections=[section.name for section in sections],
+        )
+
+        with self._lock:
+            self.resumes += 1
+            self.original_tokens += result.original_tokens
+            self.compacted_tokens += result.compacted_tokens
+            self.truncated += truncated
+        logger.info(
+            f"Compacted resume from {result.original_tokens} to {result.compacted_tokens} tokens "
+            f"({result.removed_lines} header, footer and page number lines removed{', truncated' if truncated else ''})"
+        )
+        return result
+
+    def stats(self):
+        with self._lock:
+            saved = self.original_tokens - self.compacted_tokens
+            return {
+                "resumes": self.resumes,
+                "tokens_saved": saved,
+                "avg_tokens_saved": saved / self.resumes if self.resumes else 0.0,
+                "saved_ratio": saved / self.original_tokens if self.original_tokens else 0.0,
+                "truncated": self.truncated,
+            }
+
+# Singleton instance
+resume_compactor = ResumeTextCompactor()
@@ -1,10 +1,13 @@
+import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import engine
 from app.models import models
 from app.api.api import api_router
+from app.services.skill_index import skill_index
 
 # Configure logging
 logging.basicConfig(
@@ -22,8 +25,16 @@ resume_logger.setLevel(logging.INFO)
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the skill index current in the background rather than in requests
+    refresher = asyncio.create_task(skill_index.run_refresher())
+    yield
+    refresher.cancel()
+
 # Create FastAPI app with more detailed metadata for Swagger UI
 app = FastAPI(
+    lifespan=lifespan,
     title="TalentMatch API",
     description="API for the TalentMatch application, managing jobs, candidates, resumes, and more.",
     version="1.0.0",
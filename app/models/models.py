@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean, Float, Table, DateTime, func, ARRAY
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, Boolean, Float, Table, DateTime, func, ARRAY, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 import enum
@@ -8,6 +8,12 @@ class JobStatus(enum.Enum):
     ACTIVE = "active"
     CLOSED = "closed"
 
+class TaskStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    DEAD = "dead"
+
 class Job(Base):
     __tablename__ = "jobs"
 
@@ -39,7 +45,7 @@ class Candidate(Base):
 
     candidate_id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    email = Column(String, nullable=False)
+    email = Column(String, nullable=False, index=True)
     phone = Column(String, nullable=True)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -56,6 +62,7 @@ class Resume(Base):
     job_id = Column(Integer, ForeignKey("jobs.job_id"), nullable=False)
     summary = Column(Text, nullable=True)
     skills = Column(ARRAY(String), default=[], nullable=True)
+    skill_ids = Column(ARRAY(BigInteger), default=[], nullable=True)  # 63-bit canonical IDs from the skill registry
     experience = Column(Text, nullable=True)
     education = Column(Text, nullable=True)
     file_path = Column(String, nullable=True)  # Path to the stored resume file
@@ -69,13 +76,22 @@ class Resume(Base):
     scores = relationship("Score", back_populates="resume")
     notes = relationship("Note", back_populates="resume")
 
+    __table_args__ = (
+        # Candidates-by-job listings and the pipeline's (job_id, file_path) lookup
+        Index("ix_resumes_job_id_file_path", "job_id", "file_path"),
+    )
+
 class Score(Base):
     __tablename__ = "scores"
 
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.job_id"))
-    resume_id = Column(Integer, ForeignKey("resumes.resume_id"))
+    resume_id = Column(Integer, ForeignKey("resumes.resume_id"), index=True)
     score = Column(Float)
+    # Per-dimension scores so totals can be recomputed when weights change
+    education_score = Column(Float, nullable=True)
+    experience_score = Column(Float, nullable=True)
+    skills_score = Column(Float, nullable=True)
     matching_skills = Column(ARRAY(String), default=[], nullable=True)
     missing_skills = Column(ARRAY(String), default=[], nullable=True)
     extra_skills = Column(ARRAY(String), default=[], nullable=True)
@@ -86,6 +102,11 @@ class Score(Base):
     job = relationship("Job", back_populates="scores")
     resume = relationship("Resume", back_populates="scores")
 
+    __table_args__ = (
+        # Ranked listings of a job's candidates (ORDER BY score DESC)
+        Index("ix_scores_job_id_score", "job_id", score.desc()),
+    )
+
 class Recruiter(Base):
     __tablename__ = "recruiters"
 
@@ -107,11 +128,55 @@ class Note(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     recruiter_id = Column(Integer, ForeignKey("recruiters.id"))
-    resume_id = Column(Integer, ForeignKey("resumes.resume_id"))
+    resume_id = Column(Integer, ForeignKey("resumes.resume_id"), index=True)
     text = Column(Text, nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
     recruiter = relationship("Recruiter", back_populates="notes")
-    resume = relationship("Resume", back_populates="notes")
\ No newline at end of file
+    resume = relationship("Resume", back_populates="notes")
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of model, prompt template and inputs
+    model_name = Column(String, nullable=False)
+    response = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=func.now(), index=True)
+    last_accessed_at = Column(DateTime, default=func.now(), index=True)
+
+class ResumeTask(Base):
+    __tablename__ = "resume_tasks"
+
+    task_id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.job_id"), nullable=False)
+    s3_key = Column(String, nullable=False)
+    weighting = Column(JSON, nullable=False)
+    status = Column(String, default=TaskStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime, default=func.now(), nullable=False)  # Not claimable before this (retry backoff)
+    locked_until = Column(DateTime, nullable=True)  # Visibility timeout of the current claim
+    locked_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Re-enqueueing a resume for the same job resets the existing task
+        UniqueConstraint("job_id", "s3_key", name="uq_resume_tasks_job_id_s3_key"),
+        # Claim query: next claimable task by status and availability
+        Index("ix_resume_tasks_status_available_at", "status", "available_at"),
+    )
+
+class ProcessingStatus(Base):
+    __tablename__ = "processing_status"
+
+    job_id = Column(Integer, ForeignKey("jobs.job_id"), primary_key=True)
+    status = Column(String, nullable=False)  # queued, processing, completed
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    started_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)  # Purged after this
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Union
 from datetime import datetime
 from enum import Enum
 
@@ -101,6 +101,15 @@ class CandidateResponse(CandidateBase):
         orm_mode = True
         from_attributes = True
 
+class SkillMatchCandidate(BaseModel):
+    candidate_id: Optional[int] = None
+    resume_id: int
+    job_id: int  # Job the resume was originally uploaded for
+    name: Optional[str] = None
+    email: Optional[str] = None
+    matched_skills: List[str] = []
+    coverage: float
+
 # Resume schemas
 class ResumeBase(BaseModel):
     job_id: int
@@ -128,6 +137,9 @@ class ScoreBase(BaseModel):
     job_id: int
     resume_id: int
     score: float
+    education_score: Optional[float] = None
+    experience_score: Optional[float] = None
+    skills_score: Optional[float] = None
     matching_skills: Optional[List[str]] = []
     missing_skills: Optional[List[str]] = []
     extra_skills: Optional[List[str]] = []
@@ -135,6 +147,27 @@ class ScoreBase(BaseModel):
 class ScoreCreate(ScoreBase):
     pass
 
+class ScoreWeights(BaseModel):
+    skills: float = Field(..., ge=0)
+    experience: float = Field(..., ge=0)
+    education: float = Field(..., ge=0)
+
+class RankedCandidate(BaseModel):
+    rank: int
+    candidate_id: Optional[int] = None
+    resume_id: int
+    name: Optional[str] = None
+    score: float
+    skills_score: float
+    experience_score: float
+    education_score: float
+
+class RescoreResponse(BaseModel):
+    job_id: int
+    weights: ScoreWeights
+    updated_scores: int
+    rankings: List[RankedCandidate] = []
+
 class Score(ScoreBase):
     id: int
     created_at: datetime
@@ -198,4 +231,45 @@ class Note(NoteBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+# Resume analysis schemas (structured LLM output)
+def parse_percentage(v):
+    """Accept 85, "85", "85%" or "85.5 %" and clamp to 0-100"""
+    if isinstance(v, str):
+        v = v.strip().rstrip("%").strip()
+    v = float(v)
+    return min(100.0, max(0.0, v))
+
+class EducationAnalysis(BaseModel):
+    degree: Optional[str] = None
+    field: Optional[str] = None
+    university: Optional[str] = None
+    year: Optional[Union[int, str]] = None
+    match_percentage: float
+
+    _match_percentage = validator('match_percentage', pre=True, allow_reuse=True)(parse_percentage)
+
+class CompanyExperience(BaseModel):
+    name: Optional[str] = None
+    role: Optional[str] = None
+    years: Optional[Union[float, str]] = None
+    key_achievements: List[str] = []
+
+class ExperienceAnalysis(BaseModel):
+    companies: List[CompanyExperience] = []
+    total_years: Optional[Union[float, str]] = None
+    match_percentage: float
+
+    _match_percentage = validator('match_percentage', pre=True, allow_reuse=True)(parse_percentage)
+
+class SkillsAnalysis(BaseModel):
+    hard_skills: List[str] = []
+    tools: List[str] = []
+    soft_skills: List[str] = []
+
+class ResumeAnalysis(BaseModel):
+    education: EducationAnalysis
+    experience: ExperienceAnalysis
+    skills: SkillsAnalysis = SkillsAnalysis()
+    summary: str
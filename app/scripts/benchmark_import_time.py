@@ -0,0 +1,79 @@
+"""
+Import-time benchmark for the API and worker entry points.
+
+Imports each module in a fresh interpreter under `python -X importtime`,
+reports the best cumulative time over several runs and the heaviest direct
+imports, and appends the result to a history file so startup cost can be
+compared across commits.
+
+    python -m app.scripts.benchmark_import_time --label "lazy llm" --repeat 5
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "import_time_history.jsonl")
+
+def measure(module):
+    """Cumulative import time of a module in microseconds, and of each of its direct imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    total = None
+    children = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() == module:
+            total = int(cumulative)
+        elif depth == 1:
+            children[name.strip()] = int(cumulative)
+    return total, children
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def run_benchmark(modules, repeat, label, history, top):
+    commit = current_commit()
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        total, children = min(runs, key=lambda run: run[0])
+        heaviest = sorted(children.items(), key=lambda item: item[1], reverse=True)[:top]
+
+        print(f"{module}: {total / 1000:.1f} ms (best of {repeat})")
+        for name, cumulative in heaviest:
+            print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+
+        if history:
+            entry = {
+                "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": commit,
+                "label": label,
+                "module": module,
+                "ms": round(total / 1000, 1),
+                "heaviest": {name: round(cumulative / 1000, 1) for name, cumulative in heaviest},
+            }
+            with open(history, "a") as history_file:
+                history_file.write(json.dumps(entry) + "\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark import time of the app entry points")
+    parser.add_argument("--modules", nargs="+", default=["app.main", "app.worker"], help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module (best is reported)")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest direct imports to report")
+    parser.add_argument("--label", default=None, help="Label stored with the results")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON lines file results are appended to ('' to skip)")
+    args = parser.parse_args()
+    run_benchmark(args.modules, args.repeat, args.label, args.history, args.top)
@@ -0,0 +1,179 @@
+"""
+Capture EXPLAIN ANALYZE plans for the hot read paths.
+
+Run once without and once with the indexes of migration 8b7d4e6f2c10 and
+compare. Drop and recreate just those indexes in psql (the full statements
+are in app/README.md); do not `alembic downgrade`, which also drops the
+tables of the later migrations:
+
+    DROP INDEX CONCURRENTLY IF EXISTS ix_scores_job_id_score;  -- and the other four
+    python -m app.scripts.benchmark_query_plans --label before --output plans_before.json
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scores_job_id_score ON scores (job_id, score DESC);  -- ...
+    python -m app.scripts.benchmark_query_plans --label after --output plans_after.json
+
+Use --seed N to add N synthetic resumes (and scores) to a scratch database
+first; the planner keeps choosing sequential scans on tiny tables, so the
+difference only shows up with a realistic row count.
+"""
+import sys
+import json
+import random
+import logging
+import argparse
+from datetime import datetime
+from sqlalchemy import text, insert
+from app.db.database import engine, SessionLocal
+from app.models.models import Candidate, Resume, Score, Job, Note
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Raw SQL equivalents of the ORM queries in the endpoints and pipeline
+QUERIES = {
+    "candidates_by_job": """
+        SELECT c.candidate_id, r.resume_id, s.score
+        FROM candidates c
+        JOIN resumes r ON c.candidate_id = r.candidate_id
+        JOIN scores s ON r.resume_id = s.resume_id
+        WHERE r.job_id = :job_id
+        ORDER BY s.score DESC
+    """,
+    "top_scores_by_job": """
+        SELECT s.resume_id, s.score
+        FROM scores s
+        WHERE s.job_id = :job_id
+        ORDER BY s.score DESC
+        LIMIT 20
+    """,
+    "resume_by_job_and_file": """
+        SELECT r.resume_id
+        FROM resumes r
+        WHERE r.job_id = :job_id AND r.file_path = ANY(:file_paths)
+    """,
+    "dashboard_job_postings": """
+        SELECT j.job_id, count(r.resume_id), avg(s.score)
+        FROM jobs j
+        LEFT OUTER JOIN resumes r ON r.job_id = j.job_id
+        LEFT OUTER JOIN scores s ON s.resume_id = r.resume_id
+        WHERE j.status = 'active'
+        GROUP BY j.job_id
+        ORDER BY j.created_at DESC
+        LIMIT 5
+    """,
+    "notes_by_resume": """
+        SELECT n.id, n.text
+        FROM notes n
+        WHERE n.resume_id = :resume_id
+    """,
+    "candidate_by_email": """
+        SELECT c.candidate_id
+        FROM candidates c
+        WHERE c.email = :email
+    """,
+}
+
+def seed_data(db, count):
+    """Insert `count` synthetic candidates with one resume and score each"""
+    job_ids = [job_id for (job_id,) in db.query(Job.job_id).all()]
+    if not job_ids:
+        logger.error("No jobs found; create some with create_test_data.py first")
+        sys.exit(1)
+
+    now = datetime.utcnow()
+    batch_tag = now.strftime("%Y%m%d%H%M%S")
+    candidate_ids = db.scalars(
+        insert(Candidate).returning(Candidate.candidate_id, sort_by_parameter_order=True),
+        [{"name": f"Seed {i}", "email": f"seed{batch_tag}_{i}@example.com", "created_at": now} for i in range(count)],
+    ).all()
+
+    resume_rows = [
+        {
+            "job_id": random.choice(job_ids),
+            "candidate_id": candidate_id,
+            "file_path": f"seed/{batch_tag}/{i}.pdf",
+            "skills": [],
+            "created_at": now,
+        }
+        for i, candidate_id in enumerate(candidate_ids)
+    ]
+    resume_ids = db.scalars(
+        insert(Resume).returning(Resume.resume_id, sort_by_parameter_order=True),
+        resume_rows,
+    ).all()
+
+    db.execute(insert(Score), [
+        {"job_id": row["job_id"], "resume_id": resume_id, "score": round(random.uniform(0, 100), 2), "created_at": now}
+        for row, resume_id in zip(resume_rows, resume_ids)
+    ])
+    db.commit()
+    logger.info(f"Seeded {count} candidates, resumes and scores")
+
+def pick_params(db):
+    """Use the busiest job and a real resume/email so the plans reflect real selectivity"""
+    job_id = db.execute(text(
+        "SELECT job_id FROM resumes GROUP BY job_id ORDER BY count(*) DESC LIMIT 1"
+    )).scalar()
+    file_paths = [path for (path,) in db.query(Resume.file_path).filter(Resume.job_id == job_id).limit(25).all()]
+    resume_id = db.query(Note.resume_id).limit(1).scalar() or db.query(Resume.resume_id).limit(1).scalar()
+    email = db.query(Candidate.email).filter(Candidate.email.isnot(None)).limit(1).scalar()
+    return {"job_id": job_id, "file_paths": file_paths, "resume_id": resume_id, "email": email}
+
+def explain(connection, sql, params):
+    plan = connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+    root = plan[0]
+    return {
+        "execution_time_ms": root["Execution Time"],
+        "planning_time_ms": root["Planning Time"],
+        "plan": root["Plan"],
+    }
+
+def plan_summary(node, depth=0):
+    """One line per plan node, e.g. 'Index Scan using ix_scores_job_id_score on scores'"""
+    label = node["Node Type"]
+    if "Index Name" in node:
+        label += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        label += f" on {node['Relation Name']}"
+    lines = ["  " * depth + label]
+    for child in node.get("Plans", []):
+        lines.extend(plan_summary(child, depth + 1))
+    return lines
+
+def run_benchmark(label, output=None, seed=0):
+    db = SessionLocal()
+    try:
+        if seed:
+            seed_data(db, seed)
+        params = pick_params(db)
+    finally:
+        db.close()
+
+    if params["job_id"] is None:
+        logger.error("No resumes found; nothing to benchmark")
+        sys.exit(1)
+
+    results = {"label": label, "captured_at": datetime.utcnow().isoformat(), "queries": {}}
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE candidates; ANALYZE resumes; ANALYZE scores; ANALYZE notes; ANALYZE jobs"))
+        for name, sql in QUERIES.items():
+            result = explain(connection, sql, params)
+            results["queries"][name] = result
+            print(f"\n== {name} ({result['execution_time_ms']:.3f} ms)")
+            print("\n".join(plan_summary(result["plan"])))
+        connection.rollback()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, default=str)
+        logger.info(f"Wrote {label} plans to {output}")
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture query plans for the hot read paths")
+    parser.add_argument("--label", default="current", help="Name for this run, e.g. before/after")
+    parser.add_argument("--output", help="Write the full JSON plans to this file")
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic resumes first")
+    args = parser.parse_args()
+    run_benchmark(args.label, args.output, args.seed)
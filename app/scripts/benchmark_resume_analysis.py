@@ -0,0 +1,120 @@
+"""
+Benchmark the single structured-output LLM call against the previous
+two-call path (COMBINED_PROMPT plus SUMMARY_RESUME_PROMPT).
+
+Reports input and output tokens per resume, per-resume latency and the
+share of resumes whose output could not be parsed or validated. Token counts
+come from the provider's usage metadata when it reports it, otherwise they
+are estimated from text length. Runs against the fake backend unless
+LLM_PROVIDER is set:
+
+    python -m app.scripts.benchmark_resume_analysis --resumes 200 --latency 0.5
+    LLM_PROVIDER=groq python -m app.scripts.benchmark_resume_analysis --resumes 20 --concurrency 2
+"""
+import os
+import time
+import asyncio
+import argparse
+import statistics
+
+os.environ.setdefault("LLM_PROVIDER", "fake")
+if os.environ["LLM_PROVIDER"] == "fake":
+    # Provider quotas do not apply to the local stand-in
+    os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+    os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", "1000")
+
+from langchain_core.output_parsers import JsonOutputParser, PydanticOutputParser
+from app.scripts.benchmark_anonymizer import build_resume
+from app.job_matcher.resume_processing_manager import create_resume_processor
+from app.job_matcher.utils.globals import get_llm
+from app.job_matcher.utils.prompt import COMBINED_PROMPT, SUMMARY_RESUME_PROMPT, RESUME_ANALYSIS_PROMPT
+from app.job_matcher.utils.rate_limiter import llm_rate_limiter, estimate_tokens, CHARS_PER_TOKEN
+from app.schemas.schemas import ResumeAnalysis
+
+JOB_DESCRIPTION = {
+    "description": "Backend engineer for our data platform",
+    "requirements": ["Python", "Spark", "SQL", "Kubernetes"],
+    "nice_to_have": ["Tableau"],
+    "hard_skills": ["python", "spark", "sql", "kubernetes", "tableau"],
+    "soft_skills": [],
+}
+WEIGHTING = {"education": 0.3, "skills": 0.4, "experience": 0.3}
+
+async def call_llm(prompt, inputs):
+    """Send one prompt and return the reply text with input and output token counts"""
+    text = prompt.format(**inputs)
+    message = await llm_rate_limiter.arun(lambda: (prompt | get_llm()).ainvoke(inputs), estimate_tokens(text))
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return message.content, usage["input_tokens"], usage["output_tokens"]
+    return message.content, len(text) // CHARS_PER_TOKEN, len(message.content) // CHARS_PER_TOKEN
+
+async def two_call_analysis(inputs):
+    """The previous path: two prompts, loose JSON parsing and percentage strings"""
+    (combined, combined_in, combined_out), (summary, summary_in, summary_out) = await asyncio.gather(
+        call_llm(COMBINED_PROMPT, inputs),
+        call_llm(SUMMARY_RESUME_PROMPT, {"resume_text": inputs["resume_text"]}),
+    )
+    parser = JsonOutputParser()
+    result, data = parser.parse(combined), parser.parse(summary)
+    # The fields the processor used to read, which raised on malformed output
+    float(result['education']['match_percentage'].strip("%"))
+    float(result['experience']['match_percentage'].strip("%"))
+    if not isinstance(data['skills']['hard_skills'], list) or not isinstance(data['skills']['soft_skills'], list):
+        raise ValueError("Skills are not lists")
+    if not data['summary']:
+        raise ValueError("Empty summary")
+    return combined_in + summary_in, combined_out + summary_out
+
+async def single_call_analysis(inputs):
+    content, tokens_in, tokens_out = await call_llm(RESUME_ANALYSIS_PROMPT, inputs)
+    PydanticOutputParser(pydantic_object=ResumeAnalysis).parse(content)
+    return tokens_in, tokens_out
+
+async def run_path(analysis, inputs_list, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies, tokens_in, tokens_out = [], [], []
+    failures = 0
+
+    async def run_one(inputs):
+        nonlocal failures
+        async with slots:
+            start = time.perf_counter()
+            try:
+                used_in, used_out = await analysis(inputs)
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+            tokens_in.append(used_in)
+            tokens_out.append(used_out)
+
+    await asyncio.gather(*(run_one(inputs) for inputs in inputs_list))
+    return latencies, tokens_in, tokens_out, failures
+
+def report(name, calls, count, latencies, tokens_in, tokens_out, failures):
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] if latencies else 0.0
+    print(f"{name:>8}  {calls:>5}  {statistics.mean(tokens_in or [0]):>9.0f}  {statistics.mean(tokens_out or [0]):>10.0f}"
+          f"  {statistics.median(latencies or [0]) * 1000:>7.0f}  {p95 * 1000:>7.0f}  {failures / count:>7.1%}")
+
+async def run_benchmark(count, kilobytes, concurrency):
+    processor = create_resume_processor(JOB_DESCRIPTION, WEIGHTING)
+    inputs_list = [processor.prepare_llm_inputs(build_resume(kilobytes, seed=seed))[0] for seed in range(count)]
+
+    print(f"{count} resumes of {kilobytes}KB, provider {os.environ['LLM_PROVIDER']}, concurrency {concurrency}")
+    print(f"{'path':>8}  {'calls':>5}  {'tokens in':>9}  {'tokens out':>10}  {'p50 ms':>7}  {'p95 ms':>7}  {'failed':>7}")
+    report("two-call", 2, count, *await run_path(two_call_analysis, inputs_list, concurrency))
+    report("single", 1, count, *await run_path(single_call_analysis, inputs_list, concurrency))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the single-call and two-call resume analysis")
+    parser.add_argument("--resumes", type=int, default=100, help="Resumes to analyse on each path")
+    parser.add_argument("--size", type=int, default=4, help="Resume size in KB")
+    parser.add_argument("--concurrency", type=int, default=20, help="Resumes analysed at once")
+    parser.add_argument("--latency", type=float, default=None, help="Fake LLM latency per call in seconds")
+    args = parser.parse_args()
+    if args.latency is not None:
+        os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(args.latency)
+    asyncio.run(run_benchmark(args.resumes, args.size, args.concurrency))
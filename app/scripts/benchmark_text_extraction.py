@@ -0,0 +1,63 @@
+"""
+Throughput benchmark for resume text extraction.
+
+Extracts the given documents repeatedly, first in the calling thread and
+then through the text extraction process pool at each requested size, and
+reports documents per second. Throughput should grow with the number of
+processes up to the number of cores.
+
+    python -m app.scripts.benchmark_text_extraction resume1.pdf resume2.docx --processes 1 2 4 --copies 20
+"""
+import io
+import os
+import time
+import pathlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from app.job_matcher.utils.file_parser import FileParser, TextExtractionPool
+
+def load_documents(paths, copies):
+    documents = []
+    for path in paths:
+        data = pathlib.Path(path).read_bytes()
+        documents.extend([(data, pathlib.Path(path).suffix.lower())] * copies)
+    return documents
+
+def run_in_thread(documents):
+    parser = FileParser()
+    start = time.time()
+    for data, extension in documents:
+        parser.extract_from_fileobj(io.BytesIO(data), extension)
+    return time.time() - start
+
+def run_in_pool(documents, processes):
+    pool = TextExtractionPool(processes=processes)
+    extract = lambda document: pool.extract(io.BytesIO(document[0]), document[1])
+    try:
+        # Callers hand documents to the pool from a thread per in-flight resume
+        with ThreadPoolExecutor(max_workers=processes * 2) as threads:
+            # Start every process before timing so spawn cost is not counted
+            list(threads.map(extract, documents[:1] * processes))
+            start = time.time()
+            list(threads.map(extract, documents))
+        return time.time() - start
+    finally:
+        pool.shutdown()
+
+def run_benchmark(paths, processes, copies):
+    documents = load_documents(paths, copies)
+    print(f"{len(documents)} documents, {os.cpu_count()} cores")
+    print(f"{'mode':>12}  {'seconds':>8}  {'docs/s':>8}")
+    elapsed = run_in_thread(documents)
+    print(f"{'thread':>12}  {elapsed:>8.2f}  {len(documents) / elapsed:>8.1f}")
+    for count in processes:
+        elapsed = run_in_pool(documents, count)
+        print(f"{f'{count} procs':>12}  {elapsed:>8.2f}  {len(documents) / elapsed:>8.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume text extraction throughput")
+    parser.add_argument("files", nargs="+", help="PDF, DOCX or TXT documents to extract")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="Pool sizes to measure")
+    parser.add_argument("--copies", type=int, default=10, help="Times each document is extracted")
+    args = parser.parse_args()
+    run_benchmark(args.files, args.processes, args.copies)
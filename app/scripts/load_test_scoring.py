@@ -0,0 +1,97 @@
+"""
+Offline load test for resume scoring.
+
+Scores synthetic resumes through ResumeProcessor with the fake LLM backend
+(LLM_PROVIDER=fake), so anonymization, prompt rendering, output parsing and
+skill matching run for real while the LLM call is a local, fixed-latency
+stand-in. Reports throughput and latency, optionally under cProfile.
+
+    python -m app.scripts.load_test_scoring --resumes 2000 --concurrency 200 --latency 1.0
+    python -m app.scripts.load_test_scoring --resumes 500 --latency 0 --profile scoring.prof
+"""
+import os
+import time
+import asyncio
+import argparse
+import cProfile
+import pstats
+import statistics
+
+# Must be set before the LLM settings are read. The cache is skipped so every
+# resume reaches the backend, and the provider quotas do not apply to it.
+os.environ["LLM_PROVIDER"] = "fake"
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "0")
+os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "0")
+os.environ.setdefault("LLM_MAX_CONCURRENCY", "1000")
+
+from app.scripts.benchmark_anonymizer import build_resume
+from app.job_matcher.resume_processing_manager import create_resume_processor
+from app.job_matcher.utils.text_compactor import resume_compactor
+
+JOB_DESCRIPTION = {
+    "description": "Backend engineer for our data platform",
+    "responsibilities": ["Build data pipelines", "Run services on Kubernetes"],
+    "requirements": ["Python", "Spark", "SQL", "Kubernetes"],
+    "nice_to_have": ["Tableau", "Power BI"],
+    "hard_skills": ["python", "spark", "sql", "kubernetes", "tableau"],
+    "soft_skills": [],
+    "title": "Backend Engineer",
+    "department": "Engineering",
+    "location": "Remote",
+    "type": "Full-time",
+}
+WEIGHTING = {"education": 0.3, "skills": 0.4, "experience": 0.3}
+
+async def score_all(processor, resumes, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def score(resume_text):
+        nonlocal failures
+        async with slots:
+            start = time.perf_counter()
+            result = await processor.aprocess_single_resume(resume_text)
+            latencies.append(time.perf_counter() - start)
+            if not result:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(score(resume_text) for resume_text in resumes))
+    return time.perf_counter() - start, latencies, failures
+
+def run_load_test(count, concurrency, kilobytes, latency, profile):
+    os.environ["FAKE_LLM_LATENCY_SECONDS"] = str(latency)
+    resumes = [build_resume(kilobytes, seed=seed) for seed in range(count)]
+    processor = create_resume_processor(JOB_DESCRIPTION, WEIGHTING)
+
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+    elapsed, latencies, failures = asyncio.run(score_all(processor, resumes, concurrency))
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(profile)
+
+    latencies.sort()
+    print(f"{count} resumes of {kilobytes}KB, concurrency {concurrency}, fake LLM latency {latency}s")
+    print(f"  elapsed      {elapsed:.2f} s")
+    print(f"  throughput   {count / elapsed * 60:.0f} resumes/min")
+    print(f"  latency p50  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"  latency p95  {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"  failures     {failures}")
+    print(f"  compaction   {resume_compactor.stats()}")
+    if profiler:
+        print(f"\nTop functions by cumulative time (full profile in {profile}):")
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test resume scoring against the fake LLM backend")
+    parser.add_argument("--resumes", type=int, default=1000, help="Resumes to score")
+    parser.add_argument("--concurrency", type=int, default=100, help="Resumes scored at once")
+    parser.add_argument("--size", type=int, default=4, help="Resume size in KB")
+    parser.add_argument("--latency", type=float, default=1.0, help="Fake LLM latency per call in seconds")
+    parser.add_argument("--profile", default=None, help="Write a cProfile dump to this path")
+    args = parser.parse_args()
+    run_load_test(args.resumes, args.concurrency, args.size, args.latency, args.profile)
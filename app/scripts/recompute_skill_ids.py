@@ -0,0 +1,72 @@
+"""
+Recompute Resume.skill_ids from Resume.skills with the current skill registry.
+
+Skill IDs are hashed from canonical names when a resume is stored, so after
+the alias table (SKILL_ALIASES_PATH) changes, rows stored earlier keep the
+IDs of their old canonical names and no longer match jobs through the new
+aliases. Run this after deploying an alias change:
+
+    python -m app.scripts.recompute_skill_ids
+    python -m app.scripts.recompute_skill_ids --dry-run
+
+Only rows whose IDs change are written. API processes pick the new IDs up
+at their next skill index rebuild (SKILL_INDEX_REFRESH_SECONDS).
+"""
+import time
+import logging
+import argparse
+from app.db.database import SessionLocal
+from app.models.models import Resume
+from app.job_matcher.skill_registry import skill_registry
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def recompute_skill_ids(batch_size, dry_run):
+    start_time = time.time()
+    db = SessionLocal()
+    scanned = changed = 0
+    last_id = 0
+    try:
+        while True:
+            # Keyset pagination keeps each batch an index range scan
+            rows = (
+                db.query(Resume.resume_id, Resume.skills, Resume.skill_ids)
+                .filter(Resume.resume_id > last_id)
+                .order_by(Resume.resume_id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].resume_id
+            scanned += len(rows)
+
+            updates = []
+            for resume_id, skills, skill_ids in rows:
+                ids = sorted(skill_registry.to_ids(skills or []))
+                if ids != sorted(skill_ids or []):
+                    updates.append({"resume_id": resume_id, "skill_ids": ids})
+            changed += len(updates)
+
+            if updates and not dry_run:
+                db.bulk_update_mappings(Resume, updates)
+                db.commit()
+            logger.info(f"Scanned {scanned} resumes, {changed} with changed skill IDs")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    action = "would change" if dry_run else "changed"
+    logger.info(f"Done in {time.time() - start_time:.2f} seconds: {scanned} resumes scanned, {action} {changed}")
+    return scanned, changed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute stored resume skill IDs after an alias table change")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Resumes read and written per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Count the rows that would change without writing")
+    args = parser.parse_args()
+    recompute_skill_ids(args.batch_size, args.dry_run)
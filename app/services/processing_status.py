@@ -0,0 +1,134 @@
+import os
+import logging
+from datetime import timedelta
+from sqlalchemy import select, update, delete, func, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.models import ProcessingStatus, ResumeTask, TaskStatus
+from app.services.progress_events import publish_progress
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Status rows are purged this long after their last update
+PROCESSING_STATUS_TTL_HOURS = int(os.getenv("PROCESSING_STATUS_TTL_HOURS", "24"))
+
+class ProcessingStatusStore:
+    """
+    Per-job processing progress shared by the API replicas and the workers.
+
+    One row per job, read by primary key. Counters are recounted from the
+    job's tasks when resumes are queued and incremented in SQL as each one
+    finishes, so concurrent workers never overwrite each other's progress.
+    Writes do not commit: they run inside the caller's transaction, so a
+    counter only moves (and its status event is only delivered) when the task
+    state change it belongs to is committed. The row doubles as the batch
+    summary: processed and failed counts and the time since the batch was
+    queued, frozen once it completes.
+    """
+
+    def __init__(self, ttl_hours=PROCESSING_STATUS_TTL_HOURS):
+        self.ttl = timedelta(hours=ttl_hours)
+
+    def start(self, db: Session, job_id):
+        """
+        Recount a job's progress from its tasks after resumes are (re)queued.
+
+        The job's row is locked first so increments from workers that finish
+        concurrently are applied after the recount instead of being lost.
+        """
+        db.execute(select(ProcessingStatus.job_id).where(ProcessingStatus.job_id == job_id).with_for_update())
+        total, processed, failed, running = db.execute(
+            select(
+                func.count(),
+                func.count().filter(ResumeTask.status == TaskStatus.DONE.value),
+                func.count().filter(ResumeTask.status == TaskStatus.DEAD.value),
+                func.count().filter(ResumeTask.status == TaskStatus.RUNNING.value),
+            ).where(ResumeTask.job_id == job_id)
+        ).one()
+
+        if processed + failed >= total:
+            status = "completed"
+        elif running or processed or failed:
+            status = "processing"
+        else:
+            status = "queued"
+
+        values = {
+            "status": status,
+            "total": total,
+            "processed": processed,
+            "failed": failed,
+            "updated_at": func.now(),
+            "expires_at": func.now() + self.ttl,
+        }
+        statement = insert(ProcessingStatus).values(job_id=job_id, started_at=func.now(), **values)
+        if status != "completed":
+            # Resumes queued after a job completed start a new batch, and its clock
+            values["started_at"] = case((ProcessingStatus.status == "completed", func.now()), else_=ProcessingStatus.started_at)
+        db.execute(statement.on_conflict_do_update(index_elements=[ProcessingStatus.job_id], set_=values))
+        publish_progress(job_id, None, "status", db=db, status=status, total=total, processed=processed, failed=failed)
+        self.purge_expired(db)
+
+    def record(self, db: Session, job_id, processed=0, failed=0):
+        """Add finished resumes to a job's counters"""
+        done = ProcessingStatus.processed + processed + ProcessingStatus.failed + failed
+        row = db.execute(
+            update(ProcessingStatus)
+            .where(ProcessingStatus.job_id == job_id)
+            .values(
+                processed=ProcessingStatus.processed + processed,
+                failed=ProcessingStatus.failed + failed,
+                status=case((done >= ProcessingStatus.total, "completed"), else_="processing"),
+                updated_at=func.now(),
+                expires_at=func.now() + self.ttl,
+            )
+            .returning(ProcessingStatus.status, ProcessingStatus.total, ProcessingStatus.processed,
+                       ProcessingStatus.failed, ProcessingStatus.started_at, ProcessingStatus.updated_at)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            return
+
+        details = {"status": row.status, "total": row.total, "processed": row.processed, "failed": row.failed}
+        if row.status == "completed":
+            details["processing_time_seconds"] = (row.updated_at - row.started_at).total_seconds()
+            logger.info(f"Processing complete for job_id={job_id}. Processed: {row.processed}, Failed: {row.failed}, "
+                        f"in {details['processing_time_seconds']:.1f} seconds")
+        publish_progress(job_id, None, "status", db=db, **details)
+
+    def purge_expired(self, db: Session):
+        db.execute(
+            delete(ProcessingStatus)
+            .where(ProcessingStatus.expires_at < func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get(self, db: AsyncSession, job_id):
+        """Current status of a job, or None if it has none or it has expired"""
+        result = (await db.execute(
+            select(ProcessingStatus, func.localtimestamp())
+            .where(ProcessingStatus.job_id == job_id, ProcessingStatus.expires_at >= func.now())
+        )).first()
+        if result is None:
+            return None
+        row, now = result
+        # A completed batch stopped its clock at its last update
+        finished_at = row.updated_at if row.status == "completed" else now
+        return {
+            "status": row.status,
+            "total": row.total,
+            "processed": row.processed,
+            "failed": row.failed,
+            "started_at": row.started_at,
+            "updated_at": row.updated_at,
+            # Batch summary under the names the in-process pipeline returned
+            "total_files": row.total,
+            "processed_files": row.processed,
+            "failed_files": row.failed,
+            "processing_time_seconds": (finished_at - row.started_at).total_seconds() if row.started_at else None,
+        }
+
+# Singleton instance
+processing_status = ProcessingStatusStore()
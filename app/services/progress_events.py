@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import asyncpg
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from app.db.database import engine, ASYNC_DATABASE_URL
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel carrying per-resume progress events
+RESUME_PROGRESS_CHANNEL = os.getenv("RESUME_PROGRESS_CHANNEL", "resume_progress")
+RESUME_PROGRESS_EVENTS_ENABLED = os.getenv("RESUME_PROGRESS_EVENTS_ENABLED", "true").lower() == "true"
+# Seconds between keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# Events buffered per subscriber; a client that falls further behind misses events
+SSE_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SSE_SUBSCRIBER_QUEUE_SIZE", "1000"))
+
+# Worker progress events are buffered this many seconds and sent together
+RESUME_PROGRESS_FLUSH_SECONDS = float(os.getenv("RESUME_PROGRESS_FLUSH_SECONDS", "0.5"))
+
+def progress_payload(job_id, s3_key, event, **details):
+    """JSON payload of one progress event, or None when it is not published"""
+    if not RESUME_PROGRESS_EVENTS_ENABLED or job_id is None:
+        return None
+    return json.dumps(
+        {"job_id": job_id, "s3_key": s3_key, "event": event, "at": time.time(), **details},
+        default=str,
+    )
+
+def notify_progress(connection, payloads):
+    """Send progress payloads with a single pg_notify statement on a connection or session"""
+    payloads = [payload for payload in payloads if payload is not None]
+    if not payloads:
+        return
+    connection.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": RESUME_PROGRESS_CHANNEL, "payloads": payloads},
+    )
+
+def publish_progress(job_id, s3_key, event, db=None, **details):
+    """
+    Publish one progress event (extracted, scored, stored, failed or status).
+
+    Events go through pg_notify so every API process sees them, whichever
+    process or worker did the work. Given a session, the event is sent in its
+    transaction and only delivered if that commits; otherwise it is sent
+    immediately and failures are logged, never raised.
+    """
+    payload = progress_payload(job_id, s3_key, event, **details)
+    if payload is None:
+        return
+    if db is not None:
+        notify_progress(db, [payload])
+        return
+
+    try:
+        with engine.connect() as connection:
+            notify_progress(connection, [payload])
+            connection.commit()
+    except Exception as e:
+        logger.warning(f"Could not publish {event} event for {s3_key}: {str(e)}")
+
+class ProgressPublisher:
+    """
+    Buffers progress events raised outside any transaction and sends them
+    together, so a worker makes one NOTIFY round-trip every flush_seconds
+    instead of one per event. run() must be running for events to be sent.
+    """
+
+    def __init__(self, flush_seconds=RESUME_PROGRESS_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self._pending = []
+
+    def add(self, job_id, s3_key, event, **details):
+        payload = progress_payload(job_id, s3_key, event, **details)
+        if payload is not None:
+            self._pending.append(payload)
+
+    def send(self, payloads):
+        try:
+            with engine.connect() as connection:
+                notify_progress(connection, payloads)
+                connection.commit()
+        except Exception as e:
+            logger.warning(f"Could not publish {len(payloads)} progress events: {str(e)}")
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        await asyncio.to_thread(self.send, batch)
+
+    async def run(self):
+        """Send buffered events every flush_seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+# Singleton instance
+progress_publisher = ProgressPublisher()
+
+class ProgressBroadcaster:
+    """
+    Fans progress events out to the SSE streams of this process.
+
+    Holds a single LISTEN connection, opened on the first subscription and
+    closed when the last subscriber leaves, and routes each notification to
+    the queues subscribed to its job. Handlers added with add_handler see
+    every event and keep the connection open for the life of the process.
+    """
+
+    def __init__(self, channel=RESUME_PROGRESS_CHANNEL):
+        self.channel = channel
+        self._subscribers = defaultdict(set)
+        self._handlers = []
+        self._listener = None
+        self._lock = asyncio.Lock()
+
+    async def ensure_listening(self):
+        """Open the LISTEN connection, or reopen it if it was lost; True if it was (re)opened"""
+        async with self._lock:
+            if self._listener is not None and not self._listener.is_closed():
+                return False
+            dsn = make_url(ASYNC_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+            self._listener = await asyncpg.connect(dsn)
+            await self._listener.add_listener(self.channel, self._on_notify)
+            logger.info(f"Listening for progress events on channel {self.channel}")
+            return True
+
+    def add_handler(self, handler):
+        """Call handler(event) for every event on the channel, whichever job it belongs to"""
+        self._handlers.append(handler)
+
+    async def _stop_listening(self):
+        async with self._lock:
+            if self._listener is None or self._subscribers or self._handlers:
+                return
+            listener, self._listener = self._listener, None
+            try:
+                await listener.close()
+            except Exception as e:
+                logger.warning(f"Error closing progress listener: {str(e)}")
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed progress event: {payload[:200]}")
+            return
+
+        for handler in self._handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.exception(f"Progress event handler failed: {str(e)}")
+
+        for queue in list(self._subscribers.get(event.get("job_id"), ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping progress event for a slow subscriber to job ID: {event.get('job_id')}")
+
+    @asynccontextmanager
+    async def subscribe(self, job_id):
+        """Queue receiving the progress events of one job"""
+        queue = asyncio.Queue(maxsize=SSE_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[job_id].add(queue)
+        try:
+            await self.ensure_listening()
+            yield queue
+        finally:
+            self._subscribers[job_id].discard(queue)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+            if not self._subscribers:
+                await self._stop_listening()
+
+# Singleton instance
+progress_broadcaster = ProgressBroadcaster()
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -1,7 +1,13 @@
 from app.models.models import Score, Resume, Candidate
-from app.job_matcher.utils.file_parser import FileParser
+from app.job_matcher.utils.file_parser import text_extraction_pool
+from app.job_matcher.skill_registry import skill_registry
 from app.services.s3_service import S3Service
+from app.services.progress_events import progress_payload, notify_progress, progress_publisher
+from sqlalchemy import insert, delete
 from sqlalchemy.orm import Session
+import asyncio
+import pathlib
+from contextlib import nullcontext
 import time
 import logging
 
@@ -12,197 +18,255 @@ class s3_process_resumes:
     def __init__(self,db_session: Session = None, job_id: int = None):
         self.db_session = db_session
         self.job_id = job_id
-        self.file_parser = FileParser()
         self.s3_service = S3Service()
-        self.processed_files = 0
-        self.failed_files = 0
 
-    def store_in_database(self, data, resume_id):
-        """Store processing results in the database"""
-        try:
-            # Create score record
-            score = Score(
-                job_id=self.job_id,
-                resume_id=resume_id,
-                score=data['totalScore'],
-                matching_skills=data['matched_skills'],
-                missing_skills=data['missing_skills'],
-                extra_skills=data['extra_skills'],
-            )
-            
-            # Update resume with extracted information
-            resume = self.db_session.query(Resume).filter(Resume.resume_id == resume_id).first()
-            if resume:
-                # Handle summary which can be either a string or a dictionary
-                if isinstance(data['summary'], dict):
-                    resume.summary = data['summary'].get('summary', '')
-                else:
-                    resume.summary = data['summary']
-                
-                # Handle skills which can be structured differently
-                hard_skills = data['skills'].get('hard_skills', []) if isinstance(data['skills'], dict) else []
-                soft_skills = data['skills'].get('soft_skills', []) if isinstance(data['skills'], dict) else []
-                resume.skills = hard_skills + soft_skills
-                
-                # Handle experience data - extract and format appropriately
-                if isinstance(data['experience'], dict):
-                    # Handle the new format with 'companies' list
-                    companies = data['experience'].get('companies', [])
-                    if companies:
-                        # Format companies data
-                        experience_text = []
-                        for company in companies:
-                            if isinstance(company, dict):
-                                company_name = company.get('name', 'Unknown')
-                                role = company.get('role', 'Unknown')
-                                years = company.get('years', 'Unknown')
-                                achievements = company.get('key_achievements', [])
-                                
-                                # Format achievements as bullet points
-                                achievements_text = ""
-                                if achievements:
-                                    achievements_text = "\n• " + "\n• ".join(achievements)
-                                
-                                exp_entry = f"{role} at {company_name}, {years} years{achievements_text}"
-                                experience_text.append(exp_entry)
-                        
-                        resume.experience = "\n\n".join(experience_text) if experience_text else "No experience found"
-                    else:
-                        # Try with positions as fallback
-                        positions = data['experience'].get('positions', [])
-                        if positions:
-                            # Format positions data
-                            experience_text = []
-                            for pos in positions:
-                                if isinstance(pos, dict):
-                                    company = pos.get('company', 'Unknown')
-                                    title = pos.get('title', 'Unknown')
-                                    duration = pos.get('duration', 'Unknown')
-                                    description = pos.get('description', '')
-                                    exp_entry = f"{title} at {company}, {duration} - {description}"
-                                    experience_text.append(exp_entry)
-                            
-                            resume.experience = "\n\n".join(experience_text) if experience_text else "No experience found"
-                        else:
-                            # No companies or positions found, use the match percentage info
-                            match_info = data['experience'].get('match_percentage', '')
-                            total_years = data['experience'].get('total_years', '')
-                            resume.experience = f"Match: {match_info}, Total Years: {total_years}"
-                else:
-                    # Just store as string if it's already a string
-                    resume.experience = str(data['experience'])
-                
-                # Handle education data - extract and format appropriately
-                if isinstance(data['education'], dict):
-                    # Check if we have a single education entry directly in the dict
-                    if 'degree' in data['education'] and 'university' in data['education']:
-                        # Format the single education entry
-                        degree = data['education'].get('degree', 'Unknown')
-                        field = data['education'].get('field', '')
-                        university = data['education'].get('university', 'Unknown')
-                        year = data['education'].get('year', '')
-                        
-                        education_text = f"{degree} in {field} from {university}, {year}"
-                        resume.education = education_text
-                    else:
-                        # Try the array format as fallback
-                        degrees = data['education'].get('degrees', [])
-                        if degrees:
-                            # Format degrees data
-                            education_text = []
-                            for deg in degrees:
-                                if isinstance(deg, dict):
-                                    institution = deg.get('institution', deg.get('university', 'Unknown'))
-                                    degree = deg.get('degree', 'Unknown')
-                                    field = deg.get('field', '')
-                                    year = deg.get('year', '')
-                                    edu_entry = f"{degree} in {field} from {institution}, {year}"
-                                    education_text.append(edu_entry)
-                            
-                            resume.education = "\n".join(education_text) if education_text else "No education found"
-                        else:
-                            # No degrees found, use the match percentage info
-                            match_info = data['education'].get('match_percentage', '')
-                            highest = data['education'].get('highest_degree', '')
-                            field = data['education'].get('field', '')
-                            resume.education = f"Match: {match_info}, Highest: {highest}, Field: {field}"
+    def apply_result_to_resume(self, resume, data):
+        """Copy extracted summary, skills, experience and education onto a resume row"""
+        # Handle summary which can be either a string or a dictionary
+        if isinstance(data['summary'], dict):
+            resume.summary = data['summary'].get('summary', '')
+        else:
+            resume.summary = data['summary']
+
+        # Handle skills which can be structured differently
+        hard_skills = data['skills'].get('hard_skills', []) if isinstance(data['skills'], dict) else []
+        soft_skills = data['skills'].get('soft_skills', []) if isinstance(data['skills'], dict) else []
+        resume.skills = hard_skills + soft_skills
+        resume.skill_ids = sorted(skill_registry.to_ids(resume.skills))
+
+        # Handle experience data - extract and format appropriately
+        if isinstance(data['experience'], dict):
+            # Handle the new format with 'companies' list
+            companies = data['experience'].get('companies', [])
+            if companies:
+                # Format companies data
+                experience_text = []
+                for company in companies:
+                    if isinstance(company, dict):
+                        company_name = company.get('name', 'Unknown')
+                        role = company.get('role', 'Unknown')
+                        years = company.get('years', 'Unknown')
+                        achievements = company.get('key_achievements', [])
+
+                        # Format achievements as bullet points
+                        achievements_text = ""
+                        if achievements:
+                            achievements_text = "\n• " + "\n• ".join(achievements)
+
+                        exp_entry = f"{role} at {company_name}, {years} years{achievements_text}"
+                        experience_text.append(exp_entry)
+
+                resume.experience = "\n\n".join(experience_text) if experience_text else "No experience found"
+            else:
+                # Try with positions as fallback
+                positions = data['experience'].get('positions', [])
+                if positions:
+                    # Format positions data
+                    experience_text = []
+                    for pos in positions:
+                        if isinstance(pos, dict):
+                            company = pos.get('company', 'Unknown')
+                            title = pos.get('title', 'Unknown')
+                            duration = pos.get('duration', 'Unknown')
+                            description = pos.get('description', '')
+                            exp_entry = f"{title} at {company}, {duration} - {description}"
+                            experience_text.append(exp_entry)
+
+                    resume.experience = "\n\n".join(experience_text) if experience_text else "No experience found"
                 else:
-                    # Just store as string if it's already a string
-                    resume.education = str(data['education'])
-                                
-                # Update candidate information if personal_info is available
-                if resume.candidate_id:
-                    self.update_candidate_info(resume.candidate_id, data)
+                    # No companies or positions found, use the match percentage info
+                    match_info = data['experience'].get('match_percentage', '')
+                    total_years = data['experience'].get('total_years', '')
+                    resume.experience = f"Match: {match_info}, Total Years: {total_years}"
+        else:
+            # Just store as string if it's already a string
+            resume.experience = str(data['experience'])
+
+        # Handle education data - extract and format appropriately
+        if isinstance(data['education'], dict):
+            # Check if we have a single education entry directly in the dict
+            if 'degree' in data['education'] and 'university' in data['education']:
+                # Format the single education entry
+                degree = data['education'].get('degree', 'Unknown')
+                field = data['education'].get('field', '')
+                university = data['education'].get('university', 'Unknown')
+                year = data['education'].get('year', '')
+
+                education_text = f"{degree} in {field} from {university}, {year}"
+                resume.education = education_text
             else:
-                logger.warning(f"Resume record with id={resume_id} not found in database")
+                # Try the array format as fallback
+                degrees = data['education'].get('degrees', [])
+                if degrees:
+                    # Format degrees data
+                    education_text = []
+                    for deg in degrees:
+                        if isinstance(deg, dict):
+                            institution = deg.get('institution', deg.get('university', 'Unknown'))
+                            degree = deg.get('degree', 'Unknown')
+                            field = deg.get('field', '')
+                            year = deg.get('year', '')
+                            edu_entry = f"{degree} in {field} from {institution}, {year}"
+                            education_text.append(edu_entry)
+
+                    resume.education = "\n".join(education_text) if education_text else "No education found"
+                else:
+                    # No degrees found, use the match percentage info
+                    match_info = data['education'].get('match_percentage', '')
+                    highest = data['education'].get('highest_degree', '')
+                    field = data['education'].get('field', '')
+                    resume.education = f"Match: {match_info}, Highest: {highest}, Field: {field}"
+        else:
+            # Just store as string if it's already a string
+            resume.education = str(data['education'])
+
+    def update_candidate_info(self, candidate, personal_info):
+        """Update candidate information with extracted personal details"""
+        # Only update if the fields are empty or the new data is better
+        if personal_info.get('name') and (not candidate.name or candidate.name == "Unknown"):
+            candidate.name = personal_info.get('name')
             
-            # Add and commit changes
-            self.db_session.add(score)
-            self.db_session.commit()
-            logger.info(f"Database transaction committed successfully")
+        if personal_info.get('email') and (not candidate.email or '@example.com' in candidate.email):
+            candidate.email = personal_info.get('email')
             
+        if personal_info.get('phone_number') and not candidate.phone:
+            candidate.phone = personal_info.get('phone_number')
+
+    def flush_results(self, batch):
+        """
+        Store a batch of (s3_key, result) pairs in the database.
+
+        Resume and candidate rows for the whole batch are loaded with one IN
+        query each, scores are bulk inserted and the batch is committed once.
+        A failure rolls back only this batch. Publishes a stored event per
+        result and returns the stored keys and {s3_key: error} for the rest;
+        failures are left to the caller to report, so each is reported once.
+        """
+        s3_keys = [s3_key for s3_key, _ in batch]
+        start_time = time.time()
+        try:
+            resumes = {}
+            for resume in (
+                self.db_session.query(Resume)
+                .filter(Resume.job_id == self.job_id, Resume.file_path.in_(s3_keys))
+                .order_by(Resume.resume_id)
+            ):
+                resumes.setdefault(resume.file_path, resume)
+
+            candidate_ids = [resume.candidate_id for resume in resumes.values() if resume.candidate_id]
+            candidates = {}
+            if candidate_ids:
+                candidates = {
+                    candidate.candidate_id: candidate
+                    for candidate in self.db_session.query(Candidate).filter(Candidate.candidate_id.in_(candidate_ids))
+                }
+
+            scores = []
+            stored = []
+            stored_keys = []
+            for s3_key, data in batch:
+                resume = resumes.get(s3_key)
+                if not resume:
+                    logger.error(f"Error: No resume record found for {s3_key}")
+                    continue
+
+                self.apply_result_to_resume(resume, data)
+                candidate = candidates.get(resume.candidate_id)
+                if candidate:
+                    self.update_candidate_info(candidate, data)
+
+                stored_keys.append(s3_key)
+                scores.append({
+                    "job_id": self.job_id,
+                    "resume_id": resume.resume_id,
+                    "score": data['totalScore'],
+                    "education_score": data['ScoreEducation'],
+                    "experience_score": data['ScoreExperience'],
+                    "skills_score": data['ScoreSkills'],
+                    "matching_skills": data['matched_skills'],
+                    "missing_skills": data['missing_skills'],
+                    "extra_skills": data['extra_skills'],
+                })
+                stored.append(resume)
+
+            if scores:
+                # Replace any earlier score for these resumes so re-processing
+                # (or a re-delivered queue task) never leaves duplicates
+                self.db_session.execute(
+                    delete(Score)
+                    .where(Score.job_id == self.job_id, Score.resume_id.in_([resume.resume_id for resume in stored]))
+                    .execution_options(synchronize_session=False)
+                )
+                self.db_session.execute(insert(Score), scores)
+
+            store_seconds = time.time() - start_time
+            # Sent in this transaction, one statement for the whole batch; skill_ids
+            # lets every API process update its skill index from the event
+            notify_progress(self.db_session, [
+                progress_payload(self.job_id, s3_key, "stored", resume_id=resume.resume_id, skill_ids=resume.skill_ids,
+                                 score=score["score"], timings={"store": store_seconds})
+                for s3_key, resume, score in zip(stored_keys, stored, scores)
+            ])
+            self.db_session.commit()
+            logger.info(f"Database batch of {len(stored)} results committed successfully")
+
         except Exception as e:
             self.db_session.rollback()
             logger.exception(f"Database error: {str(e)}")
-            
-    def update_candidate_info(self, candidate_id, personal_info):
-        """Update candidate information with extracted personal details"""
-        try:
-            candidate = self.db_session.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
-            
-            if candidate:
-                # Only update if the fields are empty or the new data is better
-                if personal_info.get('name') and (not candidate.name or candidate.name == "Unknown"):
-                    candidate.name = personal_info.get('name')
-                    
-                if personal_info.get('email') and (not candidate.email or '@example.com' in candidate.email):
-                    candidate.email = personal_info.get('email')
-                    
-                if personal_info.get('phone_number') and not candidate.phone:
-                    candidate.phone = personal_info.get('phone_number')
-                    
-                logger.info(f"Candidate information updated successfully")
-            else:
-                logger.warning(f"Candidate with id={candidate_id} not found in database")
-                
-        except Exception as e:
-            logger.exception(f"Error updating candidate information: {str(e)}")
-            # Don't raise the exception so it doesn't affect the main transaction
-            
-        logger.info(f"Directory processing complete. Processed: {self.processed_files}, Failed: {self.failed_files}")
-            
-    def process_s3_resumes(self, s3_keys, manager):
-        logger.info(f"Starting batch processing of {s3_keys} resumes from S3")
-        start_time = time.time()
-        
-        for s3_key in s3_keys:
-            resume_text = self.file_parser.extract_text_from_file(s3_key, s3_service=self.s3_service)
-            
-            if not resume_text:
-                logger.error(f"Error: Could not extract text from {s3_key}")
-                self.failed_files += 1
-                continue
-
-            result = manager.process_single_resume(resume_text)
-            if not result:
-                self.failed_files += 1
-                continue
-            
-            resumedb = self.db_session.query(Resume).filter(Resume.file_path == s3_key, Resume.job_id == self.job_id).first()
-            if not resumedb:
-                self.failed_files += 1
-                continue
-            
-            # Store in database if session available
-            resume_id = resumedb.resume_id
-            if self.db_session and self.job_id and resume_id:
-                self.store_in_database(result, resume_id)
-            
-            self.processed_files += 1
-        
-        return {
-            "total_files": len(s3_keys),
-            "processed_files": self.processed_files,
-            "failed_files": self.failed_files,
-            "processing_time_seconds": time.time() - start_time
-        }
+            return [], {s3_key: str(e) for s3_key in s3_keys}
+
+        return stored_keys, {s3_key: "No resume record found" for s3_key in set(s3_keys) - set(stored_keys)}
+
+    def fetch_resume(self, s3_key):
+        """Stream a resume from S3 into a spooled buffer (fetch stage)"""
+        return self.s3_service.open_file(s3_key)
+
+    def extract_resume_text(self, s3_key, fileobj):
+        """
+        Extract text from a fetched resume and release its buffer (extraction stage).
+
+        Parsing runs in the text extraction process pool; the calling thread
+        only waits for it, so it does not hold the GIL meanwhile.
+        """
+        with fileobj:
+            extension = pathlib.Path(s3_key).suffix.lower()
+            return text_extraction_pool.extract(fileobj, extension)
+
+    async def aprocess_single(self, s3_key, manager, stage_slots=None):
+        """
+        Fetch, extract and score one resume, raising on any failure.
+
+        Used by the queue worker, which buffers the result, stores it in a
+        batch with flush_results and handles retries itself. stage_slots maps
+        "fetch", "extract" and "llm" to the semaphore limiting that stage;
+        stage timings leave out the time spent waiting for them.
+        """
+        stage_slots = stage_slots or {}
+        timings = {}
+        async with stage_slots.get("fetch", nullcontext()):
+            stage_start = time.time()
+            fileobj = await asyncio.to_thread(self.fetch_resume, s3_key)
+            timings["fetch"] = time.time() - stage_start
+
+        async with stage_slots.get("extract", nullcontext()):
+            stage_start = time.time()
+            resume_text = await asyncio.to_thread(self.extract_resume_text, s3_key, fileobj)
+            timings["extract"] = time.time() - stage_start
+        if not resume_text:
+            raise ValueError(f"Could not extract text from {s3_key}")
+        self.publish(s3_key, "extracted", characters=len(resume_text), timings=dict(timings))
+
+        async with stage_slots.get("llm", nullcontext()):
+            stage_start = time.time()
+            result = await manager.aprocess_single_resume(resume_text)
+            timings["llm"] = time.time() - stage_start
+        if not result:
+            raise ValueError(f"Could not score {s3_key}")
+        compaction = result.get('compaction')
+        self.publish(s3_key, "scored", score=result['totalScore'], compaction=compaction, timings=dict(timings))
+        logger.info(f"Scored {s3_key} with stage timings: {timings}, compaction: {compaction}")
+        return result
+
+    def publish(self, s3_key, event, **details):
+        """Queue a progress event for the worker's progress publisher, which sends events in batches"""
+        progress_publisher.add(self.job_id, s3_key, event, **details)
@@ -1,25 +1,97 @@
 # app/services/s3_service.py
 import os
-import boto3
 import logging
+import threading
 import time
 from fastapi import UploadFile, HTTPException
-from io import BytesIO
 import tempfile
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Downloads stay in memory up to this size and spill to a temp file above it
+S3_SPOOL_MAX_BYTES = int(os.getenv("S3_SPOOL_MAX_BYTES", str(10 * 1024 * 1024)))
+S3_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Connection pool and retry settings for the shared S3 client
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+S3_RETRY_MODE = os.getenv("S3_RETRY_MODE", "adaptive")
+S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "5"))
+S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "60"))
+
+# Upload tuning: files uploaded in parallel per request, multipart part size
+# and parts uploaded in parallel per file
+S3_UPLOAD_CONCURRENCY = int(os.getenv("S3_UPLOAD_CONCURRENCY", "8"))
+S3_UPLOAD_PART_SIZE = int(os.getenv("S3_UPLOAD_PART_SIZE_MB", "8")) * 1024 * 1024
+S3_UPLOAD_PART_CONCURRENCY = int(os.getenv("S3_UPLOAD_PART_CONCURRENCY", "4"))
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+_s3_client_metrics = {
+    "cold_start_seconds": None,
+    "warm_lookups": 0,
+    "warm_lookup_seconds_total": 0.0,
+}
+
+def get_s3_client():
+    """
+    Return the process-wide S3 client, creating it on first use.
+    boto3 clients are thread-safe, so one pooled client serves every request and worker.
+    """
+    global _s3_client
+    start_time = time.perf_counter()
+    client = _s3_client
+    if client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                # boto3 takes a noticeable share of startup, so load it with the client
+                import boto3
+                from botocore.config import Config
+
+                session = boto3.session.Session(
+                    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                    region_name=os.getenv("AWS_REGION", "us-east-1")
+                )
+                _s3_client = session.client(
+                    's3',
+                    config=Config(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        tcp_keepalive=True,
+                        connect_timeout=S3_CONNECT_TIMEOUT,
+                        read_timeout=S3_READ_TIMEOUT,
+                        retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": S3_RETRY_MODE}
+                    )
+                )
+                _s3_client_metrics["cold_start_seconds"] = time.perf_counter() - start_time
+                logger.info(f"Created shared S3 client in {_s3_client_metrics['cold_start_seconds']:.3f} seconds")
+                return _s3_client
+            client = _s3_client
+
+    with _s3_client_lock:
+        _s3_client_metrics["warm_lookups"] += 1
+        _s3_client_metrics["warm_lookup_seconds_total"] += time.perf_counter() - start_time
+    return client
+
+def get_s3_client_metrics():
+    """Cold client construction time versus the average warm lookup, in milliseconds"""
+    with _s3_client_lock:
+        cold = _s3_client_metrics["cold_start_seconds"]
+        lookups = _s3_client_metrics["warm_lookups"]
+        total = _s3_client_metrics["warm_lookup_seconds_total"]
+    return {
+        "cold_start_ms": cold * 1000 if cold is not None else None,
+        "warm_lookups": lookups,
+        "avg_warm_lookup_ms": (total / lookups) * 1000 if lookups else None,
+        "max_pool_connections": S3_MAX_POOL_CONNECTIONS,
+    }
+
 class S3Service:
     def __init__(self):
-        # Initialize S3 client from environment variables
+        # Reuse the shared, pooled S3 client
         logger.info("Initializing S3Service")
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_REGION", "us-east-1")
-        )
+        self.s3_client = get_s3_client()
         self.bucket_name = os.getenv("S3_BUCKET_NAME", "gammachallenge")
         self.prefix = "resumes/"
         logger.info(f"S3Service initialized with bucket: {self.bucket_name}, prefix: {self.prefix}")
@@ -27,28 +99,31 @@ class S3Service:
     def upload_file(self, file: UploadFile) -> str:
         """
         Upload a file to S3 bucket
+        Streams the spooled upload in S3_UPLOAD_PART_SIZE parts without reading it into memory.
         Returns the S3 key of the uploaded file
         """
         start_time = time.time()
         logger.info(f"Starting S3 upload for file: {file.filename}, size: {file.size if hasattr(file, 'size') else 'unknown'}, content-type: {file.content_type}")
         
         try:
-            # Read file content
-            file_content = file.file.read()
-            content_size = len(file_content)
-            logger.info(f"Read {content_size} bytes from file {file.filename}")
-            
             # Create S3 key (folder/filename.pdf)
             s3_key = f"{self.prefix}{file.filename}"
             logger.info(f"Generated S3 key: {s3_key}")
             
-            # Upload file to S3
+            # Upload file to S3, using multipart for anything above one part
             logger.info(f"Uploading to S3 bucket: {self.bucket_name}")
+            file.file.seek(0)
+            from boto3.s3.transfer import TransferConfig
             self.s3_client.upload_fileobj(
-                BytesIO(file_content),
+                file.file,
                 self.bucket_name,
                 s3_key,
-                ExtraArgs={"ContentType": file.content_type}
+                ExtraArgs={"ContentType": file.content_type},
+                Config=TransferConfig(
+                    multipart_threshold=S3_UPLOAD_PART_SIZE,
+                    multipart_chunksize=S3_UPLOAD_PART_SIZE,
+                    max_concurrency=S3_UPLOAD_PART_CONCURRENCY
+                )
             )
             
             # Rewind the file for future reads
@@ -96,6 +171,39 @@ class S3Service:
             logger.exception(f"S3 download failed for {s3_key}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"S3 download failed: {str(e)}")
     
+    def open_file(self, s3_key: str):
+        """
+        Stream a file from S3 into a spooled buffer
+        Returns a seekable file object positioned at the start; the caller closes it.
+        Objects larger than S3_SPOOL_MAX_BYTES are written to a named temp file,
+        deleted on close, so text extraction can open them by path.
+        """
+        start_time = time.time()
+        logger.info(f"Starting S3 streaming download for key: {s3_key}")
+
+        buffer = None
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            if response.get("ContentLength", 0) > S3_SPOOL_MAX_BYTES:
+                buffer = tempfile.NamedTemporaryFile()
+            else:
+                buffer = tempfile.SpooledTemporaryFile(max_size=S3_SPOOL_MAX_BYTES)
+            for chunk in response["Body"].iter_chunks(chunk_size=S3_DOWNLOAD_CHUNK_BYTES):
+                buffer.write(chunk)
+            size = buffer.tell()
+            buffer.flush()
+            buffer.seek(0)
+
+            elapsed_time = time.time() - start_time
+            logger.info(f"S3 streaming download completed for {s3_key} ({size} bytes) in {elapsed_time:.2f} seconds")
+            return buffer
+
+        except Exception as e:
+            if buffer is not None:
+                buffer.close()
+            logger.exception(f"S3 download failed for {s3_key}: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"S3 download failed: {str(e)}")
+    
     def list_files(self) -> list:
         """
         List all PDF files in the S3 bucket prefix
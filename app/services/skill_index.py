@@ -0,0 +1,141 @@
+import os
+import time
+import heapq
+import asyncio
+import logging
+import threading
+from collections import Counter, defaultdict
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.models import Resume
+from app.job_matcher.skill_registry import skill_registry
+from app.services.progress_events import progress_broadcaster
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Full rebuild from the database after this many seconds, catching any
+# stored event this process missed
+SKILL_INDEX_REFRESH_SECONDS = int(os.getenv("SKILL_INDEX_REFRESH_SECONDS", "300"))
+# How often the background refresher checks its LISTEN connection
+SKILL_INDEX_CHECK_SECONDS = 15
+
+class SkillIndex:
+    """
+    In-memory inverted index from canonical skill ID to resume IDs.
+
+    Built from Resume.skill_ids (or Resume.skills for rows written before the
+    registry existed) by a background task, which also applies the "stored"
+    progress events the workers publish over pg_notify. A resume is therefore
+    searchable in every API process as soon as its worker stores it, and
+    top-K lookups only touch the postings of the requested skills.
+    """
+
+    def __init__(self, refresh_seconds=SKILL_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._postings = defaultdict(set)
+        self._resume_skills = {}
+        self._built_at = None
+        # Updates received while a rebuild reads the table, replayed onto its result
+        self._updates_during_build = None
+        self._lock = threading.RLock()
+
+    def build(self, db: Session):
+        """Rebuild the whole index from the resumes table"""
+        start_time = time.time()
+        with self._lock:
+            self._updates_during_build = {}
+        rows = db.query(Resume.resume_id, Resume.skill_ids, Resume.skills).all()
+
+        postings = defaultdict(set)
+        resume_skills = {}
+        for resume_id, skill_ids, skills in rows:
+            ids = frozenset(skill_ids) if skill_ids else frozenset(skill_registry.to_ids(skills or []))
+            if not ids:
+                continue
+            resume_skills[resume_id] = ids
+            for sid in ids:
+                postings[sid].add(resume_id)
+
+        with self._lock:
+            updates, self._updates_during_build = self._updates_during_build, None
+            self._postings = postings
+            self._resume_skills = resume_skills
+            self._built_at = time.time()
+            for resume_id, skill_ids in updates.items():
+                self.update(resume_id, skill_ids)
+
+        logger.info(f"Skill index built with {len(resume_skills)} resumes and {len(postings)} skills in {time.time() - start_time:.2f} seconds")
+
+    def ensure_built(self, db: Session):
+        """Build the index if the background refresher has not built it yet"""
+        if self._built_at is None:
+            self.build(db)
+
+    def rebuild(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        finally:
+            db.close()
+
+    def apply_event(self, event):
+        """Progress event handler: index a resume once its worker has stored it"""
+        if event.get("event") == "stored" and "skill_ids" in event:
+            self.update(event["resume_id"], event["skill_ids"])
+
+    async def run_refresher(self):
+        """
+        Keep the index current until cancelled.
+
+        Listens for stored events and rebuilds from the database at startup,
+        every refresh_seconds, and whenever the LISTEN connection had to be
+        reopened, since events sent while it was down are lost.
+        """
+        progress_broadcaster.add_handler(self.apply_event)
+        while True:
+            try:
+                reopened = await progress_broadcaster.ensure_listening()
+                stale = self._built_at is None or time.time() - self._built_at > self.refresh_seconds
+                if reopened or stale:
+                    await asyncio.to_thread(self.rebuild)
+            except Exception as e:
+                logger.exception(f"Skill index refresh failed: {str(e)}")
+            await asyncio.sleep(SKILL_INDEX_CHECK_SECONDS)
+
+    def update(self, resume_id, skill_ids):
+        """Replace the postings of a single resume"""
+        ids = frozenset(skill_ids or [])
+        with self._lock:
+            if self._updates_during_build is not None:
+                self._updates_during_build[resume_id] = ids
+            for sid in self._resume_skills.pop(resume_id, ()):
+                self._postings[sid].discard(resume_id)
+            if ids:
+                self._resume_skills[resume_id] = ids
+                for sid in ids:
+                    self._postings[sid].add(resume_id)
+
+    def top_k(self, skills, k=10):
+        """
+        Rank resumes by how many of the given skills they have.
+
+        Returns a list of (resume_id, matched_skill_ids, coverage) sorted by
+        coverage, where coverage is the fraction of requested skills matched.
+        """
+        query_ids = skill_registry.to_ids(skills)
+        if not query_ids:
+            return []
+
+        counts = Counter()
+        with self._lock:
+            for sid in query_ids:
+                counts.update(self._postings.get(sid, ()))
+            best = heapq.nsmallest(k, counts.items(), key=lambda item: (-item[1], item[0]))
+            return [
+                (resume_id, sorted(self._resume_skills[resume_id] & query_ids), count / len(query_ids))
+                for resume_id, count in best
+            ]
+
+# Singleton instance
+skill_index = SkillIndex()
@@ -0,0 +1,180 @@
+import os
+import logging
+from collections import Counter
+from datetime import timedelta
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.models import ResumeTask, TaskStatus
+from app.services.processing_status import processing_status
+from app.services.progress_events import publish_progress
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# A claimed task becomes claimable again if its worker has not finished it
+# within this many seconds (worker crashed, was killed or lost its connection)
+RESUME_TASK_VISIBILITY_TIMEOUT = int(os.getenv("RESUME_TASK_VISIBILITY_TIMEOUT", "600"))
+# Deliveries before a task is dead-lettered
+RESUME_TASK_MAX_ATTEMPTS = int(os.getenv("RESUME_TASK_MAX_ATTEMPTS", "5"))
+# Retry backoff: base * 2^(attempt - 1) seconds, capped
+RESUME_TASK_RETRY_BASE_SECONDS = int(os.getenv("RESUME_TASK_RETRY_BASE_SECONDS", "30"))
+RESUME_TASK_RETRY_MAX_SECONDS = int(os.getenv("RESUME_TASK_RETRY_MAX_SECONDS", "1800"))
+
+class ResumeTaskQueue:
+    """
+    Postgres-backed work queue with one task per (job_id, s3_key).
+
+    Workers claim tasks with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+    of worker processes can poll the same table without handing out a task
+    twice. A claim sets locked_until; a task whose worker never reports back is
+    delivered again once that passes. Delivery is at-least-once, so processing
+    a task must be idempotent.
+    """
+
+    def __init__(self, visibility_timeout=RESUME_TASK_VISIBILITY_TIMEOUT, max_attempts=RESUME_TASK_MAX_ATTEMPTS):
+        self.visibility_timeout = timedelta(seconds=visibility_timeout)
+        self.max_attempts = max_attempts
+
+    def enqueue(self, db: Session, job_id, s3_keys, weighting):
+        """Add tasks for the given resumes, resetting any existing task for the same job and key"""
+        if not s3_keys:
+            return 0
+
+        statement = insert(ResumeTask).values([
+            {"job_id": job_id, "s3_key": s3_key, "weighting": weighting}
+            for s3_key in dict.fromkeys(s3_keys)
+        ])
+        statement = statement.on_conflict_do_update(
+            constraint="uq_resume_tasks_job_id_s3_key",
+            set_={
+                "weighting": statement.excluded.weighting,
+                "status": TaskStatus.PENDING.value,
+                "attempts": 0,
+                "available_at": func.now(),
+                "locked_until": None,
+                "locked_by": None,
+                "last_error": None,
+                "updated_at": func.now(),
+            },
+        )
+        result = db.execute(statement)
+        processing_status.start(db, job_id)
+        db.commit()
+        logger.info(f"Enqueued {result.rowcount} resume tasks for job ID: {job_id}")
+        return result.rowcount
+
+    def claim(self, db: Session, worker_id):
+        """
+        Claim the next available task for this worker, or return None.
+
+        Pending tasks are available once available_at passes; running tasks
+        once their visibility timeout expires. Tasks that have used up their
+        attempts are dead-lettered instead of being handed out again.
+        """
+        while True:
+            task = db.execute(
+                select(ResumeTask)
+                .where(or_(
+                    and_(ResumeTask.status == TaskStatus.PENDING.value, ResumeTask.available_at <= func.now()),
+                    and_(ResumeTask.status == TaskStatus.RUNNING.value, ResumeTask.locked_until < func.now()),
+                ))
+                .order_by(ResumeTask.available_at, ResumeTask.task_id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalars().first()
+
+            if task is None:
+                db.commit()
+                return None
+
+            if task.attempts >= self.max_attempts:
+                logger.error(f"Task {task.task_id} ({task.s3_key}) timed out on its last attempt, dead-lettering")
+                task.status = TaskStatus.DEAD.value
+                task.locked_until = None
+                task.last_error = task.last_error or "Visibility timeout expired on final attempt"
+                processing_status.record(db, task.job_id, failed=1)
+                db.commit()
+                continue
+
+            task.status = TaskStatus.RUNNING.value
+            task.attempts += 1
+            task.locked_by = worker_id
+            task.locked_until = func.now() + self.visibility_timeout
+            processing_status.record(db, task.job_id)
+            db.commit()
+            return task
+
+    def complete(self, db: Session, task_ids, worker_id):
+        """Mark tasks done, skipping any another worker has since reclaimed; returns the IDs completed"""
+        rows = db.execute(
+            update(ResumeTask)
+            .where(ResumeTask.task_id.in_(task_ids), ResumeTask.locked_by == worker_id,
+                   ResumeTask.status == TaskStatus.RUNNING.value)
+            .values(status=TaskStatus.DONE.value, locked_until=None, last_error=None)
+            .returning(ResumeTask.task_id, ResumeTask.job_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for job_id, count in Counter(job_id for _, job_id in rows).items():
+            processing_status.record(db, job_id, processed=count)
+        db.commit()
+        return {task_id for task_id, _ in rows}
+
+    def defer(self, db: Session, task_id, worker_id, delay, reason):
+        """
+        Put a task back to be claimed again after delay seconds, without
+        using up an attempt (the LLM provider was rate limiting, not failing)
+        """
+        rescheduled = db.execute(
+            update(ResumeTask)
+            .where(ResumeTask.task_id == task_id, ResumeTask.locked_by == worker_id,
+                   ResumeTask.status == TaskStatus.RUNNING.value)
+            .values(
+                status=TaskStatus.PENDING.value,
+                attempts=ResumeTask.attempts - 1,
+                available_at=func.now() + timedelta(seconds=delay),
+                locked_until=None,
+                last_error=str(reason)[:2000],
+                updated_at=func.now(),
+            )
+            .returning(ResumeTask.task_id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        db.commit()
+        if rescheduled is not None:
+            logger.info(f"Task {task_id} deferred for {delay:.0f}s: {reason}")
+        return rescheduled is not None
+
+    def fail(self, db: Session, task_id, worker_id, error):
+        """Schedule a retry with exponential backoff, or dead-letter the task"""
+        task = db.execute(
+            select(ResumeTask)
+            .where(ResumeTask.task_id == task_id, ResumeTask.locked_by == worker_id,
+                   ResumeTask.status == TaskStatus.RUNNING.value)
+            .with_for_update()
+        ).scalars().first()
+        if task is None:
+            db.commit()
+            return None
+
+        task.last_error = str(error)[:2000]
+        task.locked_until = None
+        will_retry = task.attempts < self.max_attempts
+        # Sent in this transaction so it arrives before the status update below
+        publish_progress(task.job_id, task.s3_key, "failed", db=db, error=task.last_error,
+                         attempt=task.attempts, will_retry=will_retry)
+        if not will_retry:
+            logger.error(f"Task {task_id} ({task.s3_key}) failed {task.attempts} times, dead-lettering: {error}")
+            task.status = TaskStatus.DEAD.value
+            processing_status.record(db, task.job_id, failed=1)
+        else:
+            delay = min(RESUME_TASK_RETRY_BASE_SECONDS * 2 ** (task.attempts - 1), RESUME_TASK_RETRY_MAX_SECONDS)
+            logger.warning(f"Task {task_id} ({task.s3_key}) failed on attempt {task.attempts}, retrying in {delay}s: {error}")
+            task.status = TaskStatus.PENDING.value
+            task.available_at = func.now() + timedelta(seconds=delay)
+        status = task.status
+        db.commit()
+        return status
+
+# Singleton instance
+resume_task_queue = ResumeTaskQueue()
@@ -0,0 +1,40 @@
+import random
+import string
+from difflib import SequenceMatcher
+from app.job_matcher.matching_skills import SkillMatcher, FUZZY_MATCH_THRESHOLD
+
+def pairwise_scores(job_skills, resume_skills):
+    """The original loop: best SequenceMatcher ratio per job skill above the threshold"""
+    scores = []
+    for job_skill in job_skills:
+        best = max(SequenceMatcher(None, job_skill, resume_skill).ratio() for resume_skill in resume_skills)
+        if best > FUZZY_MATCH_THRESHOLD:
+            scores.append(best)
+    return scores
+
+def typo(skill, rng):
+    chars = list(skill)
+    for _ in range(rng.randint(1, 2)):
+        chars[rng.randrange(len(chars))] = rng.choice(string.ascii_lowercase)
+    if rng.random() < 0.3:
+        chars.insert(rng.randrange(len(chars) + 1), rng.choice(string.ascii_lowercase))
+    return "".join(chars)
+
+def test_matches_with_few_shared_bigrams_are_kept():
+    for job_skill, resume_skill in [("mysql", "yosql"), ("nosql", "mnsql"), ("airflow", "iensorflow")]:
+        matcher = SkillMatcher([job_skill, "kubernetes"])
+        assert matcher.partial_scores([job_skill], [resume_skill, "terraform"]) == pairwise_scores([job_skill], [resume_skill, "terraform"])
+        assert matcher.partial_scores([job_skill], [resume_skill]) != []
+
+def test_scores_match_the_pairwise_loop():
+    rng = random.Random(7)
+    vocabulary = [
+        "python", "mysql", "nosql", "airflow", "tensorflow", "kubernetes", "docker", "terraform",
+        "spark", "kafka", "postgresql", "react", "typescript", "graphql", "pandas", "scikit-learn",
+    ]
+    for _ in range(500):
+        job_skills = rng.sample(vocabulary, rng.randint(1, 8))
+        resume_skills = [typo(skill, rng) for skill in rng.sample(vocabulary, rng.randint(1, 10))]
+        matcher = SkillMatcher(job_skills)
+        canonical = matcher.job_skills
+        assert matcher.partial_scores(canonical, resume_skills) == pairwise_scores(canonical, resume_skills)
@@ -0,0 +1,73 @@
+from app.job_matcher.utils.text_compactor import ResumeTextCompactor, PAGE_BREAK, TRUNCATION_MARKER
+
+JOBS = [
+    ("Senior Engineer, Acme", "2019 - 2023", "Led a team of six"),
+    ("Engineer, Globex", "2016 - 2019", "Cut batch runtimes by half"),
+    ("Junior Engineer, Initech", "2013 - 2016", "Maintained the billing service"),
+]
+
+def build_pages():
+    """One job per page, each page with the same running header and a numbered footer"""
+    pages = []
+    for number, (title, dates, achievement) in enumerate(JOBS, start=1):
+        pages.append("\n".join([
+            "Jane Doe - Curriculum Vitae",
+            "",
+            "Experience" if number == 1 else "",
+            title,
+            dates,
+            "Responsibilities:",
+            "Built data pipelines in Python",
+            "Ran services on Kubernetes",
+            achievement,
+            "",
+            f"Page {number} of {len(JOBS)}",
+        ]))
+    return pages
+
+def compact(text, token_budget=10000):
+    return ResumeTextCompactor(token_budget=token_budget, enabled=True).compact(text)
+
+def test_running_headers_footers_and_page_numbers_are_removed():
+    result = compact(PAGE_BREAK.join(build_pages()))
+    lines = result.text.split("\n")
+
+    assert lines.count("Jane Doe - Curriculum Vitae") == 1
+    assert not any(line.startswith("Page ") for line in lines)
+    assert result.removed_lines == 5
+
+def test_date_ranges_and_repeated_headings_survive():
+    result = compact(PAGE_BREAK.join(build_pages()))
+    lines = result.text.split("\n")
+
+    for title, dates, achievement in JOBS:
+        assert title in lines
+        assert dates in lines
+        assert achievement in lines
+    assert lines.count("Responsibilities:") == len(JOBS)
+    assert lines.count("Built data pipelines in Python") == len(JOBS)
+
+def test_nothing_is_removed_without_page_breaks():
+    text = "\n".join(build_pages())
+    result = compact(text)
+
+    assert result.removed_lines == 0
+    assert result.text.split("\n").count("Jane Doe - Curriculum Vitae") == len(JOBS)
+
+def test_over_budget_resume_keeps_short_sections_whole():
+    experience = [f"Company {index}: built systems with Spark and Kafka pipelines" for index in range(200)]
+    text = "\n".join(
+        ["Experience"] + experience
+        + ["Education", "MSc Computer Science, 2012"]
+        + ["Skills", "python, spark, sql"]
+        + ["Interests", "chess, hiking"]
+    )
+    result = compact(text, token_budget=300)
+    lines = result.text.split("\n")
+
+    assert result.truncated
+    assert result.compacted_tokens <= 300
+    assert TRUNCATION_MARKER in lines
+    assert "MSc Computer Science, 2012" in lines
+    assert "python, spark, sql" in lines
+    assert "chess, hiking" not in lines
@@ -0,0 +1,288 @@
+"""
+Standalone resume processing worker.
+
+Claims resume tasks from the Postgres queue one at a time per slot and runs
+them through fetch, extraction and LLM scoring, each stage with its own
+concurrency limit. Results from every slot are stored in batches, and their
+tasks completed, by a write-behind buffer. Run any number of these alongside
+the API:
+
+    python -m app.worker
+"""
+import os
+import json
+import signal
+import socket
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from app.db.database import SessionLocal
+from app.models.models import Job
+from app.services.task_queue import resume_task_queue
+from app.services.s3_process_resumes import s3_process_resumes
+from app.services.resume_processing_service import get_job_description_data
+from app.services.progress_events import progress_publisher
+from app.job_matcher.resume_processing_manager import create_resume_processor
+from app.job_matcher.utils.file_parser import text_extraction_pool
+from app.job_matcher.utils.llm_cache import llm_cache
+from app.job_matcher.utils.text_compactor import resume_compactor
+from app.job_matcher.utils.rate_limiter import LLMRateLimited
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[
+        logging.StreamHandler(),  # Log to console
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Tasks each stage works on at once within one worker process. A task only
+# holds a stage's limit while in that stage, so a slow stage never keeps the
+# others idle
+RESUME_FETCH_WORKERS = int(os.getenv("RESUME_FETCH_WORKERS", "8"))
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "4"))
+RESUME_LLM_WORKERS = int(os.getenv("RESUME_LLM_WORKERS", "4"))
+STAGE_LIMITS = {"fetch": RESUME_FETCH_WORKERS, "extract": RESUME_EXTRACT_WORKERS, "llm": RESUME_LLM_WORKERS}
+# Tasks in flight in one worker process, across all stages; by default enough
+# for every stage to be busy at once
+RESUME_WORKER_CONCURRENCY = int(os.getenv("RESUME_WORKER_CONCURRENCY", str(sum(STAGE_LIMITS.values()))))
+# How long an idle slot waits before polling the queue again
+RESUME_WORKER_POLL_SECONDS = float(os.getenv("RESUME_WORKER_POLL_SECONDS", "2"))
+# Cap on the backoff of a slot whose queue calls keep failing (database down,
+# tables not created yet)
+RESUME_WORKER_MAX_BACKOFF_SECONDS = float(os.getenv("RESUME_WORKER_MAX_BACKOFF_SECONDS", "60"))
+# Scored results are stored in batches of this size, or sooner once the oldest
+# buffered result has waited RESUME_DB_FLUSH_INTERVAL seconds
+RESUME_DB_BATCH_SIZE = int(os.getenv("RESUME_DB_BATCH_SIZE", "25"))
+RESUME_DB_FLUSH_INTERVAL = float(os.getenv("RESUME_DB_FLUSH_INTERVAL", "5"))
+# Resume processors (prompts and skill matchers) kept per job and weighting
+PROCESSOR_CACHE_SIZE = 32
+
+class ResumeWorker:
+    def __init__(self, concurrency=RESUME_WORKER_CONCURRENCY, poll_seconds=RESUME_WORKER_POLL_SECONDS,
+                 batch_size=RESUME_DB_BATCH_SIZE, flush_interval=RESUME_DB_FLUSH_INTERVAL, stage_limits=STAGE_LIMITS):
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency
+        self.stage_limits = dict(stage_limits)
+        # Shared by all slots; a task takes each stage's semaphore in turn
+        self.stage_slots = {stage: asyncio.Semaphore(limit) for stage, limit in stage_limits.items()}
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._processors = {}
+        self._stopping = None
+        # Write-behind buffer of (task, result) pairs waiting to be stored
+        self._pending = []
+        self._pending_since = None
+
+    def claim_task(self):
+        """Claim the next task and copy out what processing needs"""
+        db = SessionLocal()
+        try:
+            task = resume_task_queue.claim(db, self.worker_id)
+            if task is None:
+                return None
+            return {
+                "task_id": task.task_id,
+                "job_id": task.job_id,
+                "s3_key": task.s3_key,
+                "weighting": task.weighting,
+                "attempts": task.attempts,
+            }
+        finally:
+            db.close()
+
+    def defer_task(self, task, error: LLMRateLimited):
+        db = SessionLocal()
+        try:
+            delay = max(error.retry_after or 0.0, self.poll_seconds)
+            resume_task_queue.defer(db, task["task_id"], self.worker_id, delay, error)
+        finally:
+            db.close()
+
+    def fail_task(self, task, error):
+        db = SessionLocal()
+        try:
+            resume_task_queue.fail(db, task["task_id"], self.worker_id, error)
+        finally:
+            db.close()
+
+    def store_results(self, batch):
+        """
+        Store a batch of (task, result) pairs and complete their tasks.
+
+        Each job's results are written in one transaction by flush_results and
+        its stored tasks completed in one more; a result that could not be
+        stored fails its task.
+        """
+        by_job = defaultdict(list)
+        for task, result in batch:
+            by_job[task["job_id"]].append((task, result))
+
+        for job_id, items in by_job.items():
+            tasks = {task["s3_key"]: task for task, _ in items}
+            db = SessionLocal()
+            try:
+                process = s3_process_resumes(db_session=db, job_id=job_id)
+                stored_keys, failures = process.flush_results([(task["s3_key"], result) for task, result in items])
+
+                task_ids = [tasks[s3_key]["task_id"] for s3_key in stored_keys]
+                completed = resume_task_queue.complete(db, task_ids, self.worker_id) if task_ids else set()
+                for task_id in set(task_ids) - completed:
+                    logger.warning(f"Task {task_id} was reclaimed by another worker before it completed")
+                for s3_key, error in failures.items():
+                    resume_task_queue.fail(db, tasks[s3_key]["task_id"], self.worker_id,
+                                           f"Could not store the result: {error}")
+            except Exception as e:
+                # The tasks are delivered again once their visibility timeout passes
+                logger.exception(f"Could not store {len(items)} results for job_id={job_id}: {str(e)}")
+            finally:
+                db.close()
+
+    def get_processor(self, job_id, weighting):
+        """Resume processor for a job, rebuilt when the job or weighting changes"""
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.job_id == job_id).first()
+            if not job:
+                raise ValueError(f"Job with ID {job_id} not found")
+
+            cache_key = (job_id, job.updated_at, json.dumps(weighting, sort_keys=True))
+            processor = self._processors.get(cache_key)
+            if processor is None:
+                if len(self._processors) >= PROCESSOR_CACHE_SIZE:
+                    self._processors.pop(next(iter(self._processors)))
+                processor = create_resume_processor(get_job_description_data(job), weighting)
+                self._processors[cache_key] = processor
+            return processor
+        finally:
+            db.close()
+
+    async def handle(self, task):
+        """
+        Score a task's resume; the result is stored later, with a batch.
+
+        Fetch, extraction and LLM scoring each run under their own limit, so
+        while some tasks wait for the LLM the other slots keep fetching and
+        extracting the next ones.
+        """
+        manager = await asyncio.to_thread(self.get_processor, task["job_id"], task["weighting"])
+        process = s3_process_resumes(job_id=task["job_id"])
+        return await process.aprocess_single(task["s3_key"], manager, self.stage_slots)
+
+    async def buffer_result(self, task, result):
+        """Queue a scored task for the write-behind buffer, flushing when a batch is full"""
+        if not self._pending:
+            self._pending_since = time.time()
+        self._pending.append((task, result))
+
+        # Partial batches are flushed by flush_periodically
+        if len(self._pending) >= self.batch_size:
+            await self.flush_pending()
+
+    async def flush_pending(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        await asyncio.to_thread(self.store_results, batch)
+        logger.info(f"Stored a batch of {len(batch)} results. LLM cache stats: {llm_cache.stats()}, "
+                    f"resume compaction stats: {resume_compactor.stats()}")
+
+    async def flush_periodically(self):
+        """Flush a partial batch once its oldest result has waited flush_interval seconds"""
+        while True:
+            wait = self.flush_interval
+            if self._pending:
+                wait = self._pending_since + self.flush_interval - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            try:
+                await self.flush_pending()
+            except Exception as e:
+                logger.exception(f"Flushing buffered results failed: {str(e)}")
+
+    async def sleep(self, seconds):
+        """Sleep for up to seconds, returning early once the worker is stopping"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_slot(self, slot):
+        """
+        Claim and process tasks until the worker stops.
+
+        A scored task is handed to the write-behind buffer and completed when
+        its batch is stored, so the slot moves straight on to the next one. A
+        failing queue call never ends the slot: it is logged and retried with
+        backoff. A task whose outcome could not be recorded is delivered again
+        once its visibility timeout passes.
+        """
+        queue_errors = 0
+        while not self._stopping.is_set():
+            try:
+                task = await asyncio.to_thread(self.claim_task)
+            except Exception as e:
+                queue_errors += 1
+                delay = min(self.poll_seconds * 2 ** (queue_errors - 1), RESUME_WORKER_MAX_BACKOFF_SECONDS)
+                logger.exception(f"Slot {slot} could not claim a task, retrying in {delay:.1f}s: {str(e)}")
+                await self.sleep(delay)
+                continue
+            queue_errors = 0
+
+            if task is None:
+                await self.sleep(self.poll_seconds)
+                continue
+
+            logger.info(f"Slot {slot} processing task {task['task_id']} ({task['s3_key']}), attempt {task['attempts']}")
+            try:
+                result = await self.handle(task)
+            except LLMRateLimited as e:
+                logger.warning(f"Task {task['task_id']} rate limited, deferring: {str(e)}")
+                await self.report_failure(task, e, self.defer_task)
+                continue
+            except Exception as e:
+                logger.exception(f"Task {task['task_id']} failed: {str(e)}")
+                await self.report_failure(task, e, self.fail_task)
+                continue
+
+            try:
+                await self.buffer_result(task, result)
+            except Exception as e:
+                logger.exception(f"Storing results failed: {str(e)}")
+
+    async def report_failure(self, task, error, report):
+        try:
+            await asyncio.to_thread(report, task, error)
+        except Exception as e:
+            logger.exception(f"Could not record the outcome of task {task['task_id']}, "
+                             f"it will be delivered again: {str(e)}")
+            await self.sleep(self.poll_seconds)
+
+    async def run(self):
+        """Process tasks until SIGINT/SIGTERM, letting in-flight tasks finish"""
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+
+        logger.info(f"Resume worker {self.worker_id} started with {self.concurrency} slots and stage limits {self.stage_limits}")
+        background = [asyncio.create_task(self.flush_periodically()), asyncio.create_task(progress_publisher.run())]
+        try:
+            await asyncio.gather(*(self.run_slot(slot) for slot in range(self.concurrency)))
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            # Results scored before the stop are stored rather than scored again
+            await self.flush_pending()
+            await progress_publisher.flush()
+            await asyncio.to_thread(text_extraction_pool.shutdown)
+        logger.info(f"Resume worker {self.worker_id} stopped")
+
+if __name__ == "__main__":
+    asyncio.run(ResumeWorker().run())